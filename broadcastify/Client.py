@@ -1,11 +1,48 @@
 import datetime
 import requests
-import pickle
+import msgspec
+import struct
+import time
 import os
 
+from collections import OrderedDict
+from dataclasses import dataclass
 from broadcastify.utility import floor_dt, floor_dt_s
 from broadcastify.calls import Call, LiveCalls, get_archived_calls
 
+class _ArchiveRecord(msgspec.Struct, array_like=True):
+    call_system: int
+    talkgroup: int
+    time_block: int
+    calls: list[Call]
+    start_time: int
+    end_time: int
+
+class _CacheFile(msgspec.Struct):
+    expire: float
+    archives: list[_ArchiveRecord]
+
+_cache_encoder = msgspec.msgpack.Encoder()
+_cache_decoder = msgspec.msgpack.Decoder(_CacheFile, strict=False)
+_cache_log_decoder = msgspec.msgpack.Decoder(_ArchiveRecord, strict=False)
+
+# Frames in the cache log are prefixed with their length as a big-endian uint32
+_FRAME_HEADER = struct.Struct(">I")
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+# Fold the log into the snapshot once it grows past this multiple of the snapshot size
+_COMPACT_RATIO = 4
+
 class Client:
     def __init__(self, **kwargs):
         self.config = {
@@ -16,34 +53,52 @@ class Client:
             "save_cache": True,
             "cache_dir": ".bc_cache",
             "cache_expire": datetime.timedelta(days=1),
+            "cache_max_entries": 10_000,
             **kwargs
         }
-        self.cache = {}
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = "Mozilla/5.0"
+        self._archives: OrderedDict[tuple[int, int, int], tuple[list[Call], int, int]] = OrderedDict()
+        self.stats = CacheStats()
+        self.cache_expire = None
+        self._cache_log = None
+        self._expire_seconds = self.config["cache_expire"].total_seconds()
         self.__load_cache()
 
         self.logged_in = self.config["credential_key"] is not None
 
+    def __store_archive(self, key: tuple[int, int, int], value: tuple[list[Call], int, int], count_eviction: bool = True):
+        # Entries share one TTL that is extended on every hit, and are kept in
+        # least-recently-used order, so the entry with the smallest remaining TTL
+        # is always the first one. Only evict when full.
+        self._archives.pop(key, None)
+        if len(self._archives) >= self.config["cache_max_entries"]:
+            self._archives.popitem(last=False)
+            if count_eviction:
+                self.stats.evictions += 1
+        self._archives[key] = value
+
     def __cache_archives(self, call_system: int, talkgroup: int, time_block: int, calls: list[Call], start_time: int, end_time: int):
-        if call_system not in self.cache:
-            self.cache[call_system] = {}
-        if talkgroup not in self.cache[call_system]:
-            self.cache[call_system][talkgroup] = {}
-        self.cache[call_system][talkgroup][time_block] = {
-            "calls": calls,
-            "start_time": start_time,
-            "end_time": end_time
-        }
+        self.__store_archive((call_system, talkgroup, time_block), (calls, start_time, end_time))
+        self.__append_cache_log(_ArchiveRecord(call_system, talkgroup, time_block, calls, start_time, end_time))
     
     def __get_cached_archives(self, call_system: int, talkgroup: int, time_block: int) -> tuple[list[Call], int, int]:
-        if call_system not in self.cache:
-            return None
-        if talkgroup not in self.cache[call_system]:
+        key = (call_system, talkgroup, time_block)
+        data = self._archives.get(key)
+        if data is None:
+            self.stats.misses += 1
             return None
-        if time_block not in self.cache[call_system][talkgroup]:
-            return None
-        data = self.cache[call_system][talkgroup][time_block]
+        self._archives.move_to_end(key)
+        self.stats.hits += 1
+        return data
+
+    def __restore_archive(self, record: _ArchiveRecord):
+        key = (record.call_system, record.talkgroup, record.time_block)
+        # Evictions while loading the cache from disk aren't counted in stats
+        self.__store_archive(key, (record.calls, record.start_time, record.end_time), count_eviction=False)
 
-        return data["calls"], data["start_time"], data["end_time"]
+    def __cache_path(self, name: str) -> str:
+        return os.path.join(self.config["cache_dir"], name)
 
     def __load_cache(self):
         if not self.config["save_cache"]:
@@ -51,31 +106,99 @@ class Client:
         
         os.makedirs(self.config["cache_dir"], exist_ok=True)
 
-        cache_file = os.path.join(self.config["cache_dir"], "cache.pickle")
+        cache_file = self.__cache_path("cache.msgpack")
         if os.path.exists(cache_file):
             try:
                 with open(cache_file, "rb") as f:
-                    self.cache = pickle.load(f)
+                    data = _cache_decoder.decode(f.read())
+                self.cache_expire = data.expire
+                for record in data.archives:
+                    self.__restore_archive(record)
             except Exception as e:
                 print(f"Failed to load cache: {e}")
+        self.__replay_cache_log()
         
         # Check if cache has expired
-        if "cache_expire" in self.cache:
-            if self.cache["cache_expire"] < datetime.datetime.now():
-                self.cache = {}
-                self.__save_cache()
+        if self.cache_expire is not None and self.cache_expire < time.time():
+            self._archives.clear()
+            self.cache_expire = None
+        if self.cache_expire is None:
+            self.__save_cache()
+
+    def __replay_cache_log(self):
+        log_file = self.__cache_path("cache.log")
+        if not os.path.exists(log_file):
+            return
+        
+        with open(log_file, "rb") as f:
+            log = memoryview(f.read())
+        offset = 0
+        while offset + _FRAME_HEADER.size <= len(log):
+            (size,) = _FRAME_HEADER.unpack_from(log, offset)
+            start = offset + _FRAME_HEADER.size
+            if start + size > len(log):
+                # Partial frame from an interrupted write
+                break
+            try:
+                record = _cache_log_decoder.decode(log[start:start + size])
+            except msgspec.DecodeError as e:
+                print(f"Failed to replay cache log: {e}")
+                break
+            offset = start + size
+            self.__restore_archive(record)
+
+        # Drop any unreadable tail so new frames are appended after the last good one
+        if offset != len(log):
+            os.truncate(log_file, offset)
+
+    def __append_cache_log(self, record: _ArchiveRecord):
+        if not self.config["save_cache"]:
+            return
+        
+        if self._cache_log is None:
+            os.makedirs(self.config["cache_dir"], exist_ok=True)
+            self._cache_log = open(self.__cache_path("cache.log"), "ab")
+        payload = _cache_encoder.encode(record)
+        self._cache_log.write(_FRAME_HEADER.pack(len(payload)) + payload)
+        self._cache_log.flush()
+
+    def __compact_cache(self):
+        if not self.config["save_cache"] or self._cache_log is None:
+            return
+        
+        self._cache_log.close()
+        self._cache_log = None
+        log_size = os.path.getsize(self.__cache_path("cache.log"))
+        if log_size > _COMPACT_RATIO * os.path.getsize(self.__cache_path("cache.msgpack")):
+            self.__save_cache()
     
     def __save_cache(self):
         if not self.config["save_cache"]:
             return
         
-        if "cache_expire" not in self.cache:
-            self.cache["cache_expire"] = datetime.datetime.now() + self.config["cache_expire"]
+        if self.cache_expire is None:
+            self.cache_expire = time.time() + self._expire_seconds
         
         os.makedirs(self.config["cache_dir"], exist_ok=True)
-        cache_file = os.path.join(self.config["cache_dir"], "cache.pickle")
-        with open(cache_file, "wb") as f:
-            pickle.dump(self.cache, f)
+        cache_file = self.__cache_path("cache.msgpack")
+        with open(cache_file + ".tmp", "wb") as f:
+            archives = [_ArchiveRecord(*key, *value) for key, value in self._archives.items()]
+            f.write(_cache_encoder.encode(_CacheFile(self.cache_expire, archives)))
+        os.replace(cache_file + ".tmp", cache_file)
+
+        # Everything in the log is now part of the snapshot
+        if self._cache_log is not None:
+            self._cache_log.close()
+            self._cache_log = None
+        open(self.__cache_path("cache.log"), "wb").close()
+
+    def cache_stats(self) -> dict:
+        return {
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "evictions": self.stats.evictions,
+            "hit_rate": self.stats.hit_rate
+        }
 
     def login(self):
         if self.logged_in:
@@ -88,27 +211,23 @@ class Client:
             "action": "auth",
             "redirect": "https://www.broadcastify.com"
         }
-        with requests.post(url, data=payload, allow_redirects=False) as response:
+        with self._session.post(url, data=payload, allow_redirects=False) as response:
             if not response.ok:
                 # Login failed by server error
                 raise Exception(f"Login failed - server error {response.status_code}")
-            with open("login.html", "w") as f:
-                f.write(response.text)
-            location_header = response.headers.get("Location")
-            if "failed=1" in location_header:
+            if "failed=1" in response.headers.get("Location", ""):
                 # Login failed by incorrect credentials
                 raise Exception("Login failed - incorrect credentials")
-            if "Set-Cookie" not in response.headers:
+            
+            # requests has already parsed Set-Cookie for us
+            credential_key = response.cookies.get("bcfyuser1")
+            if not credential_key:
                 # Login failed by unknown error
                 print(response.headers)
-                raise Exception("Login failed - unknown error")
-            
-            cookies = response.headers.get("Set-Cookie").rstrip().split("; ")
-            if not "bcfyuser1" in cookies[0]:
                 raise Exception("Login failed - unknown error (bcfyuser cookie not found)")
             
             self.logged_in = True
-            self.config["credential_key"] = cookies[0].split("=")[1]
+            self.config["credential_key"] = credential_key
 
     def logout(self):
         if not self.logged_in:
@@ -118,7 +237,7 @@ class Client:
         cookies = {
             "bcfyuser1": self.config["credential_key"]
         }
-        with requests.get(url, cookies=cookies) as response:
+        with self._session.get(url, cookies=cookies) as response:
             if not response.ok:
                 raise Exception(f"Logout failed - server error {response.status_code}")
     
@@ -131,21 +250,21 @@ class Client:
             self.logged_in = False
             self.credential_key = None
         if self.config["save_cache"]:
-            self.__save_cache()
+            self.__compact_cache()
     
     def get_archived_calls(self, call_system: int, talkgroup: int, time_block: int) -> tuple[list[Call], int, int]:
         if not self.logged_in:
             raise Exception("Not logged in")
         
         # Round time block to nearest 30 minutes
-        time_block = floor_dt_s(time_block, datetime.timedelta(minutes=30))
+        time_block = floor_dt_s(time_block, 1800)
 
         # Check if calls are cached
         if cached := self.__get_cached_archives(call_system, talkgroup, time_block):
             return cached
         
         # Get archived calls and cache them
-        calls, st, et = get_archived_calls(call_system, talkgroup, time_block, self.config["credential_key"])
+        calls, st, et = get_archived_calls(call_system, talkgroup, time_block, self.config["credential_key"], session=self._session)
         self.__cache_archives(call_system, talkgroup, time_block, calls, st, et)
         return calls, st, et
 
@@ -153,4 +272,4 @@ class Client:
         if not self.logged_in:
             raise Exception("Not logged in")
         
-        return LiveCalls(call_system, talkgroup, self.config["credential_key"], **kwargs)
\ No newline at end of file
+        return LiveCalls(call_system, talkgroup, self.config["credential_key"], session=self._session, **kwargs)
\ No newline at end of file
@@ -3,16 +3,20 @@ Main client interface for interacting with Broadcastify services.
 """
 
 import logging
+import threading
 from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime
 import requests
 
 from .models import Call, Feed, System, Talkgroup
-from .scrapers import CallScraper, FeedScraper, SystemScraper
-from .utils import RateLimiter, Cache
+from .utils import RateLimiter, Cache, REQUEST_TIMEOUT, retrying_adapter
 
 logger = logging.getLogger(__name__)
 
+# Connections kept open to broadcastify.com; covers the most requests any
+# scraper makes at once (FeedScraper's default 16 page workers)
+_POOL_SIZE = 16
+
 class BroadcastifyClient:
     """
     High-level client for interacting with Broadcastify services.
@@ -31,16 +35,57 @@ class BroadcastifyClient:
         self._session = requests.Session()
         self._session.headers.update({
             "User-Agent": "Mozilla/5.0",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8"
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            # Only advertises br when brotli is installed to decode it
+            "Accept-Encoding": requests.utils.DEFAULT_ACCEPT_ENCODING
         })
+        # Mounted once here; the scrapers all share this session and never remount it
+        self._session.mount("https://", retrying_adapter(_POOL_SIZE))
+        # Every scraper shares rate_limiter, so a response asking us to slow down pauses them all
+        self._session.hooks["response"].append(self._note_rate_limit)
         
-        # Initialize scrapers with this client instance
-        self.call_scraper = CallScraper(self)
-        self.feed_scraper = FeedScraper(self._session)
-        self.system_scraper = SystemScraper(self)
+        # Scrapers are created on first use, possibly from several threads at once
+        self._scrapers_lock = threading.Lock()
+        self._call_scraper = None
+        self._feed_scraper = None
+        self._system_scraper = None
         
         self._credential_key = None
     
+    def _note_rate_limit(self, response: requests.Response, *args, **kwargs) -> None:
+        """Session response hook feeding rate limit headers to the shared limiter."""
+        self.rate_limiter.update_from_headers(response.headers)
+    
+    @property
+    def call_scraper(self):
+        """Scraper for the calls platform."""
+        if self._call_scraper is None:
+            with self._scrapers_lock:
+                if self._call_scraper is None:
+                    from .scrapers import CallScraper
+                    self._call_scraper = CallScraper(self)
+        return self._call_scraper
+    
+    @property
+    def feed_scraper(self):
+        """Scraper for live audio feeds."""
+        if self._feed_scraper is None:
+            with self._scrapers_lock:
+                if self._feed_scraper is None:
+                    from .scrapers import FeedScraper
+                    self._feed_scraper = FeedScraper(self._session, cache=self.cache, rate_limiter=self.rate_limiter)
+        return self._feed_scraper
+    
+    @property
+    def system_scraper(self):
+        """Scraper for radio systems and talkgroups."""
+        if self._system_scraper is None:
+            with self._scrapers_lock:
+                if self._system_scraper is None:
+                    from .scrapers import SystemScraper
+                    self._system_scraper = SystemScraper(self)
+        return self._system_scraper
+    
     def login(self) -> bool:
         """
         Authenticate with Broadcastify.
@@ -50,7 +95,7 @@ class BroadcastifyClient:
         """
         try:
             # First, get the login page to get any necessary tokens
-            response = self._session.get("https://www.broadcastify.com/login")
+            response = self._session.get("https://www.broadcastify.com/login", timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
             # Make login request
@@ -64,12 +109,13 @@ class BroadcastifyClient:
             response = self._session.post(
                 "https://www.broadcastify.com/login",
                 data=data,
-                allow_redirects=True
+                allow_redirects=True,
+                timeout=REQUEST_TIMEOUT
             )
             response.raise_for_status()
             
             # Check if login was successful by looking for success indicators
-            if "Login - Broadcastify" not in response.text:
+            if b"Login - Broadcastify" not in response.content:
                 logger.info("Login successful")
                 return True
             else:
@@ -108,8 +154,7 @@ class BroadcastifyClient:
     
     def get_feed(self, feed_id: int) -> Optional[Feed]:
         """Get information about a live audio feed."""
-        # Implementation here
-        pass
+        return self.feed_scraper.get_feed(feed_id)
     
     def get_feeds_by_state(self, state: Union[int, str]) -> List[Feed]:
         """Get all feeds for a state (can use state name or ID)."""
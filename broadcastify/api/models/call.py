@@ -1,17 +1,25 @@
 """Call model."""
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Dict
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Call:
     """Represents a call on a talkgroup."""
     id: int
     system_id: int
     talkgroup_id: int
     timestamp: str
-    description: str
+    duration: float = 0.0  # seconds; the live calls API sends fractional durations
+    source: str = ""
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        return {
+            'id': self.id,
+            'system_id': self.system_id,
+            'talkgroup_id': self.talkgroup_id,
+            'timestamp': self.timestamp,
+            'duration': self.duration,
+            'source': self.source
+        }
@@ -1,9 +1,9 @@
 """Coverage models."""
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Dict, Optional
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TalkgroupCoverage:
     """Represents a talkgroup coverage entry."""
     id: int
@@ -15,9 +15,16 @@ class TalkgroupCoverage:
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        return {
+            'id': self.id,
+            'display': self.display,
+            'description': self.description,
+            'system': self.system,
+            'last_seen': self.last_seen,
+            'system_id': self.system_id
+        }
 
-@dataclass
+@dataclass(slots=True)
 class ServiceCoverage:
     """Represents coverage for a service type (Law, Fire, EMS)."""
     tag_id: int
@@ -1,9 +1,9 @@
 """System model."""
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Dict, Optional
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class System:
     """Represents a Broadcastify system."""
     id: int
@@ -12,4 +12,8 @@ class System:
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description
+        }
@@ -1,9 +1,9 @@
 """Talkgroup model."""
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Dict, Optional
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Talkgroup:
     """Represents a talkgroup in a system."""
     id: int
@@ -11,7 +11,15 @@ class Talkgroup:
     alpha: str
     description: str
     tag: Optional[str] = None
+    encrypted: bool = False
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        return {
+            'id': self.id,
+            'system_id': self.system_id,
+            'alpha': self.alpha,
+            'description': self.description,
+            'tag': self.tag,
+            'encrypted': self.encrypted
+        }
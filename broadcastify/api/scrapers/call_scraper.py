@@ -2,17 +2,44 @@
 Scraper for Broadcastify call information.
 """
 
-import json
 import logging
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
+import msgspec
 import requests
 
 from ..models import Call
-from ..utils.rate_limiter import RateLimiter
+from ..utils.rate_limiter import REQUEST_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
+class _AjaxCall(msgspec.Struct):
+    """A call as returned by the live calls AJAX endpoint."""
+    id: int
+    start: float
+    dur: float
+    audio: Optional[str] = None
+    tg: Optional[int] = None  # only sent for system-wide requests
+
+class _AjaxResponse(msgspec.Struct):
+    """Live calls AJAX response."""
+    calls: List[_AjaxCall] = []
+
+class _AjaxSystemResponse(msgspec.Struct):
+    """Live calls AJAX response for a whole system; calls must be present."""
+    calls: List[_AjaxCall]
+
+# Lax mode accepts numbers sent as strings, like the float() casts it replaces
+_ajax_decoder = msgspec.json.Decoder(_AjaxResponse, strict=False)
+_ajax_system_decoder = msgspec.json.Decoder(_AjaxSystemResponse, strict=False)
+
+# Sent with every calls request, on top of the client session's own headers
+_AJAX_HEADERS = {
+    "Accept": "application/json, text/javascript, */*; q=0.01",
+    "X-Requested-With": "XMLHttpRequest"
+}
+
 class CallScraper:
     """
     Scraper for Broadcastify call information.
@@ -25,26 +52,53 @@ class CallScraper:
     
     def __init__(self, client):
         self.client = client
-        self.rate_limiter = RateLimiter()
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "Mozilla/5.0",
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-            "X-Requested-With": "XMLHttpRequest"
-        })
+        # Shared with the client's other scrapers
+        self.rate_limiter = client.rate_limiter
+        # Cap in-flight requests per endpoint; the rate limiter only spaces them out
+        self._live_sem = threading.BoundedSemaphore(4)
+        self._archive_sem = threading.BoundedSemaphore(2)
+        # Talkgroup pages already loaded for their tokens this session
+        self._primed_talkgroups: set[Tuple[int, int]] = set()
+        self._primed_systems: set[int] = set()
+        # Share the client's session so calls reuse its connections and login cookies
+        self.session = client._session
     
-    def _make_request(self, url: str, method: str = "GET", data: Dict = None) -> Optional[dict]:
+    def _fetch(self, url: str, endpoint: str, method: str = "GET", data: Dict = None) -> Optional[bytes]:
+        """
+        Make a rate-limited request and return the raw response body.
+        
+        endpoint is "live" or "archive", picking the in-flight cap and rate limit used.
+        """
+        live = endpoint == "live"
+        with self._live_sem if live else self._archive_sem:
+            self.rate_limiter.wait(endpoint)
+            try:
+                if method == "GET":
+                    response = self.session.get(url, headers=_AJAX_HEADERS, timeout=REQUEST_TIMEOUT)
+                else:
+                    response = self.session.post(url, data=data, headers=_AJAX_HEADERS, timeout=REQUEST_TIMEOUT)
+                response.raise_for_status()
+                return response.content
+            except requests.HTTPError as e:
+                if e.response.status_code in (401, 403):
+                    # Tokens are no longer valid, so every talkgroup page must be loaded again
+                    self._primed_talkgroups.clear()
+                    self._primed_systems.clear()
+                logger.error(f"Error fetching {url}: {e}")
+                return None
+            except Exception as e:
+                logger.error(f"Error fetching {url}: {e}")
+                return None
+    
+    def _make_request(self, url: str, endpoint: str, method: str = "GET", data: Dict = None) -> Optional[dict]:
         """Make a rate-limited request and return JSON response."""
-        self.rate_limiter.wait("live" if "live" in url else "archive")
+        raw = self._fetch(url, endpoint, method=method, data=data)
+        if raw is None:
+            return None
         try:
-            if method == "GET":
-                response = self.session.get(url)
-            else:
-                response = self.session.post(url, data=data)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            logger.error(f"Error fetching {url}: {e}")
+            return msgspec.json.decode(raw)
+        except msgspec.DecodeError as e:
+            logger.error(f"Error decoding {url}: {e}")
             return None
     
     def get_live_calls(self, system_id: int, talkgroup_id: int) -> List[Call]:
@@ -61,43 +115,84 @@ class CallScraper:
         url = f"https://www.broadcastify.com/calls/tg/{system_id}/{talkgroup_id}"
         
         # First, load the talkgroup page to get any necessary tokens
-        self.session.get(url)
+        key = (system_id, talkgroup_id)
+        if key not in self._primed_talkgroups:
+            if self._fetch(url, "live") is None:
+                return []
+            self._primed_talkgroups.add(key)
         
         # Now make the AJAX request for live calls
-        data = {
+        response = self._post_live_calls({
             "action": "get_calls",
             "system": system_id,
             "talkgroup": talkgroup_id,
             "time": datetime.now().timestamp()
-        }
+        })
+        if response is None:
+            return []
+        
+        return [self._to_call(call, system_id, talkgroup_id) for call in response.calls]
+    
+    def get_live_calls_for_system(self, system_id: int) -> Optional[List[Call]]:
+        """
+        Get live calls for every talkgroup of a system in one request.
         
-        response = self._make_request(
+        Args:
+            system_id: System ID
+            
+        Returns:
+            List of Call objects, or None if the request failed or the reply
+            isn't a system-wide call list (no calls, or calls without a
+            talkgroup), so callers can fall back to get_live_calls for each
+            talkgroup
+        """
+        # Load the system page for its tokens, as get_live_calls does for talkgroups
+        if system_id not in self._primed_systems:
+            if self._fetch(f"https://www.broadcastify.com/calls/trs/{system_id}", "live") is None:
+                return None
+            self._primed_systems.add(system_id)
+        
+        response = self._post_live_calls({
+            "action": "get_calls",
+            "system": system_id,
+            "time": datetime.now().timestamp()
+        }, decoder=_ajax_system_decoder)
+        if response is None:
+            return None
+        if not response.calls or any(call.tg is None for call in response.calls):
+            logger.debug("System %s reply has no calls with talkgroups", system_id)
+            return None
+        
+        return [self._to_call(call, system_id, call.tg) for call in response.calls]
+    
+    def _post_live_calls(self, data: Dict, decoder: msgspec.json.Decoder = _ajax_decoder):
+        """Post a live calls AJAX request and decode the response."""
+        raw = self._fetch(
             f"https://www.broadcastify.com/calls/ajax/",
+            "live",
             method="POST",
             data=data
         )
         
-        if not response or "calls" not in response:
-            return []
-            
-        calls = []
-        for call_data in response["calls"]:
-            try:
-                call = Call(
-                    id=call_data["id"],
-                    system_id=system_id,
-                    talkgroup_id=talkgroup_id,
-                    start_time=datetime.fromtimestamp(float(call_data["start"])),
-                    duration=float(call_data["dur"]),
-                    audio_url=call_data.get("audio"),
-                    source="live"
-                )
-                calls.append(call)
-            except Exception as e:
-                logger.error(f"Error parsing call data: {e}")
-                continue
-                
-        return calls
+        if not raw:
+            return None
+        
+        try:
+            return decoder.decode(raw)
+        except msgspec.DecodeError as e:
+            logger.error(f"Error parsing call data: {e}")
+            return None
+    
+    @staticmethod
+    def _to_call(call: _AjaxCall, system_id: int, talkgroup_id: int) -> Call:
+        return Call(
+            id=call.id,
+            system_id=system_id,
+            talkgroup_id=talkgroup_id,
+            timestamp=datetime.fromtimestamp(call.start).isoformat(),
+            duration=call.dur,
+            source="live"
+        )
     
     def get_archived_calls(
         self,
@@ -122,4 +217,5 @@ class CallScraper:
             Dictionary of coverage information
         """
         url = f"https://www.broadcastify.com/calls/coverage/ctid/?tagId={tag_id}&ctid={county_id}"
-        return self._make_request(url) or {}
+        # Coverage lookups share the archive endpoints' limits
+        return self._make_request(url, "archive") or {}
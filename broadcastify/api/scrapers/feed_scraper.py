@@ -2,17 +2,195 @@
 Scraper for Broadcastify feed information.
 """
 
+import io
 import re
+import time
+import hashlib
 import logging
-from typing import Dict, List, Optional, Union
-from bs4 import BeautifulSoup, Tag
+import threading
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple, Union
 import requests
+from lxml import etree, html
 
 from ..models import Feed, MetroFeed, ServiceCoverage, TalkgroupCoverage
-from ..utils.rate_limiter import RateLimiter
+from ..utils.cache import Cache
+from ..utils.rate_limiter import REQUEST_TIMEOUT, RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# Default number of pages fetched at once
+_MAX_WORKERS = 16
+
+# Seconds a cached page is used without asking the server whether it changed
+_PAGE_FRESH = 300
+
+# Seconds a parsed page result is reused within one scraper
+_RESULT_TTL = 60.0
+
+# Coverage pages fetched at once for a single county
+_COVERAGE_WORKERS = 8
+
+_FEED_ID_RE = re.compile(r'l-(\d+)')
+_TAG_ID_RE = re.compile(r'tagId=(\d+)')
+
+# Select boxes on the state page, and the (ID, name) of their "ctid,ID" / "mid,ID" options
+_COUNTY_SELECT_RE = re.compile(rb'<select[^>]*name="ctid"[^>]*>(.*?)</select>', re.S)
+_METRO_SELECT_RE = re.compile(rb'<select(?=[^>]*name="mid")(?=[^>]*class="[^"]*navBox)[^>]*>(.*?)</select>', re.S)
+_OPTION_RE = re.compile(rb'<option[^>]*value="\w+,(\d+)"[^>]*>([^<]*)')
+
+# Map of state names to IDs - from website's select list
+_STATE_IDS = MappingProxyType({
+    'alabama': 1,
+    'alaska': 2,
+    'arizona': 4,
+    'arkansas': 5,
+    'california': 6,
+    'colorado': 8,
+    'connecticut': 9,
+    'delaware': 10,
+    'district of columbia': 11,
+    'florida': 12,
+    'georgia': 13,
+    'guam': 66,
+    'hawaii': 15,
+    'idaho': 16,
+    'illinois': 17,
+    'indiana': 18,
+    'iowa': 19,
+    'kansas': 20,
+    'kentucky': 21,
+    'louisiana': 22,
+    'maine': 23,
+    'maryland': 24,
+    'massachusetts': 25,
+    'michigan': 26,
+    'minnesota': 27,
+    'mississippi': 28,
+    'missouri': 29,
+    'montana': 30,
+    'nebraska': 31,
+    'nevada': 32,
+    'new hampshire': 33,
+    'new jersey': 34,
+    'new mexico': 35,
+    'new york': 36,
+    'north carolina': 37,
+    'north dakota': 38,
+    'ohio': 39,
+    'oklahoma': 40,
+    'oregon': 41,
+    'pennsylvania': 42,
+    'puerto rico': 72,
+    'rhode island': 44,
+    'south carolina': 45,
+    'south dakota': 46,
+    'tennessee': 47,
+    'texas': 48,
+    'utah': 49,
+    'vermont': 50,
+    'virgin islands': 78,
+    'virginia': 51,
+    'washington': 53,
+    'west virginia': 54,
+    'wisconsin': 55,
+    'wyoming': 56
+})
+
+def _by_class(tag: str, cls: str, axis: str = './/') -> str:
+    """XPath matching elements that carry cls among their classes, like bs4's class_ lookup."""
+    return f'{axis}{tag}[contains(concat(" ", normalize-space(@class), " "), " {cls} ")]'
+
+# XPath expressions are compiled once and reused for every page
+_TEXT_XP = etree.XPath('string()')
+_CELLS_XP = etree.XPath('./td|./th')
+_HAS_HEADER_CELL_XP = etree.XPath('boolean(.//th)')
+_TD_XP = etree.XPath('.//td')
+_FEED_TABLE_XP = etree.XPath(f"({_by_class('table', 'btable', '//')})[1]")
+_DESC_SPAN_XP = etree.XPath(_by_class('span', 'rrfont'))
+_COUNTY_SELECT_XP = etree.XPath('//select[@name="ctid"]')
+_METRO_SELECT_XP = etree.XPath(_by_class('select', 'navBox', '//') + '[@name="mid"]')
+_SERVICE_SELECT_XP = etree.XPath('//form[@action="/calls/coverage/ctid/"]//select[@name="tagId"]')
+_CARD_HEADER_XP = etree.XPath(_by_class('h6', 'card-header'))
+_GROUPS_TABLE_XP = etree.XPath(_by_class('table', 'groupsTable'))
+_TITLE_XP = etree.XPath(_by_class('h1', 'btitle', '//'))
+_DESCRIPTION_XP = etree.XPath(_by_class('div', 'bdescription', '//'))
+_STATUS_XP = etree.XPath(_by_class('div', 'bstatus', '//'))
+
+def _first(node: etree._Element, xpath: etree.XPath) -> Optional[etree._Element]:
+    """Return the first element matching xpath, or None."""
+    found = xpath(node)
+    return found[0] if found else None
+
+def _text(node: etree._Element) -> str:
+    """Return all the text inside node, stripped."""
+    return _TEXT_XP(node).strip()
+
+def _iter_coverage_cards(content: bytes):
+    """
+    Yield the service cards of a coverage page as they are parsed.
+    
+    Each card is discarded, along with everything parsed before it, once the
+    caller moves on, so large pages never sit in memory as a whole tree.
+    """
+    for _, element in etree.iterparse(io.BytesIO(content), events=('end',), tag='div', html=True):
+        if 'card-frame' in (element.get('class') or '').split():
+            yield element
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+@functools.lru_cache(maxsize=128)
+def _state_id(state: Union[int, str]) -> Optional[int]:
+    """Get state ID from name or ID, remembering recently looked up names."""
+    if isinstance(state, int):
+        return state
+    return _STATE_IDS.get(state.lower().strip())
+
+def _option_ids(select_re: re.Pattern, content: bytes) -> Optional[List[int]]:
+    """Return the IDs in a select box's option values, or None if the box wasn't found."""
+    match = select_re.search(content)
+    if not match:
+        return None
+    options = _OPTION_RE.findall(match.group(1))
+    if logger.isEnabledFor(logging.DEBUG):
+        for option_id, name in options:
+            logger.debug(f"Found option {name.decode(errors='replace').strip()} (ID: {int(option_id)})")
+    return [int(option_id) for option_id, _ in options]
+
+def _result_or_default(future: Future, default):
+    """Return a page future's result, logging the error and returning default if it failed."""
+    try:
+        return future.result()
+    except Exception as e:
+        logger.error(f"Error scraping page: {e}")
+        return default
+
+def _result_or_empty(future: Future) -> List[Feed]:
+    """Return a page future's feeds, logging and skipping the page if it failed."""
+    return _result_or_default(future, [])
+
+def _memoized(method):
+    """Reuse a method's non-empty result for _RESULT_TTL seconds, keyed by its arguments."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with self._results_lock:
+            hit = self._results.get(key)
+        if hit is not None and hit[0] > now:
+            return list(hit[1])
+        
+        result = method(self, *args, **kwargs)
+        # Empty results usually mean a failed fetch, so don't hold on to them
+        if result:
+            with self._results_lock:
+                self._results[key] = (now + _RESULT_TTL, result)
+        return list(result)
+    return wrapper
+
 class FeedScraper:
     """
     Scraper for Broadcastify feed information.
@@ -24,131 +202,123 @@ class FeedScraper:
     - /listen/feed/{feed_id}   (individual feed)
     """
     
-    def __init__(self, session: requests.Session):
-        """Initialize feed scraper."""
+    def __init__(self, session: requests.Session, max_workers: int = _MAX_WORKERS, cache: Optional[Cache] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
+        """
+        Initialize feed scraper.
+        
+        Fetched pages are kept in cache when one is given. Pass the client's
+        rate_limiter to share its limits with the other scrapers. The session
+        is used as given; mount retrying_adapter on it with a pool of at least
+        max_workers connections, as BroadcastifyClient does.
+        """
         self.session = session
-        self.rate_limiter = RateLimiter()
+        self.max_workers = max_workers
+        self.cache = cache
+        self.rate_limiter = rate_limiter or RateLimiter()
         # Track which states we've already scraped coverage for
         self._scraped_coverage_states = set()
+        self._coverage_lock = threading.Lock()
+        # Recently parsed results, see _memoized
+        self._results: Dict[tuple, tuple] = {}
+        self._results_lock = threading.Lock()
+    
+    def clear_cache(self) -> None:
+        """Forget recently parsed county, metro and coverage results."""
+        with self._results_lock:
+            self._results.clear()
     
     def _get_state_id(self, state: Union[int, str]) -> Optional[int]:
         """Get state ID from name or ID."""
-        if isinstance(state, int):
-            return state
-            
-        # Map of state names to IDs - from website's select list
-        state_ids = {
-            'alabama': 1,
-            'alaska': 2,
-            'arizona': 4,
-            'arkansas': 5,
-            'california': 6,
-            'colorado': 8,
-            'connecticut': 9,
-            'delaware': 10,
-            'district of columbia': 11,
-            'florida': 12,
-            'georgia': 13,
-            'guam': 66,
-            'hawaii': 15,
-            'idaho': 16,
-            'illinois': 17,
-            'indiana': 18,
-            'iowa': 19,
-            'kansas': 20,
-            'kentucky': 21,
-            'louisiana': 22,
-            'maine': 23,
-            'maryland': 24,
-            'massachusetts': 25,
-            'michigan': 26,
-            'minnesota': 27,
-            'mississippi': 28,
-            'missouri': 29,
-            'montana': 30,
-            'nebraska': 31,
-            'nevada': 32,
-            'new hampshire': 33,
-            'new jersey': 34,
-            'new mexico': 35,
-            'new york': 36,
-            'north carolina': 37,
-            'north dakota': 38,
-            'ohio': 39,
-            'oklahoma': 40,
-            'oregon': 41,
-            'pennsylvania': 42,
-            'puerto rico': 72,
-            'rhode island': 44,
-            'south carolina': 45,
-            'south dakota': 46,
-            'tennessee': 47,
-            'texas': 48,
-            'utah': 49,
-            'vermont': 50,
-            'virgin islands': 78,
-            'virginia': 51,
-            'washington': 53,
-            'west virginia': 54,
-            'wisconsin': 55,
-            'wyoming': 56
-        }
-        
-        state_name = state.lower().strip()
-        return state_ids.get(state_name)
+        return _state_id(state)
 
-    def _make_request(self, url: str) -> Optional[BeautifulSoup]:
+    def _get_page(self, url: str) -> bytes:
+        """
+        Fetch a page body, serving it from the page cache when possible.
+        
+        Cached pages are used as-is while fresh. Once stale they are
+        revalidated with the server, which answers 304 without a body if
+        the page hasn't changed.
+        """
+        key = hashlib.sha1(url.encode()).hexdigest()
+        cached = self.cache.get(key, "page") if self.cache is not None else None
+        headers = {}
+        if cached is not None:
+            fetched_at, etag, last_modified, content = cached
+            if time.time() - fetched_at < _PAGE_FRESH:
+                return content
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        
+        # Wait for rate limit
+        self.rate_limiter.wait()
+        
+        response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        
+        if response.status_code == 304 and cached is not None:
+            etag = response.headers.get("ETag", etag)
+            last_modified = response.headers.get("Last-Modified", last_modified)
+        else:
+            content = response.content
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+        
+        if self.cache is not None:
+            self.cache.set(key, (time.time(), etag, last_modified, content), "page")
+        return content
+    
+    def _make_request(self, url: str) -> Optional[html.HtmlElement]:
         """Make a request to the Broadcastify website."""
         try:
-            # Wait for rate limit
-            self.rate_limiter.wait()
-            
-            response = self.session.get(url)
-            response.raise_for_status()
+            content = self._get_page(url)
             
-            return BeautifulSoup(response.text, 'html.parser')
+            # Raw bytes let lxml pick up the encoding from the page itself
+            return html.fromstring(content)
         except Exception as e:
             logger.error(f"Error fetching {url}: {e}")
             return None
     
-    def _parse_feed_row(self, row: Tag, metro_id: Optional[int] = None) -> Optional[Feed]:
+    def _parse_feed_row(self, row: html.HtmlElement, metro_id: Optional[int] = None) -> Optional[Feed]:
         """Parse a feed row from the table."""
         try:
-            cells = row.find_all(['td', 'th'])
+            cells = _CELLS_XP(row)
             if not cells or len(cells) < 5:
                 return None
                 
             # Skip header rows
-            if row.find('th'):
+            if _HAS_HEADER_CELL_XP(row):
                 return None
                 
             # Get feed ID from the cell's ID attribute
-            feed_id_match = re.search(r'l-(\d+)', cells[0].get('id', ''))
+            feed_id_match = _FEED_ID_RE.search(cells[0].get('id', ''))
             if not feed_id_match:
                 return None
             feed_id = int(feed_id_match.group(1))
             
             # Get feed name and description from the second cell
-            name_link = cells[1].find('a')
-            if not name_link:
+            name_link = cells[1].find('.//a')
+            if name_link is None:
                 return None
-            name = name_link.text.strip()
+            name = _text(name_link)
             
             # Description is in a rrfont span if present
-            desc_span = cells[1].find('span', {'class': 'rrfont'})
-            description = desc_span.text.strip() if desc_span else ''
+            desc_span = _first(cells[1], _DESC_SPAN_XP)
+            description = _text(desc_span) if desc_span is not None else ''
             
             # Get location from the third cell
-            location = cells[2].text.strip()
+            location = _text(cells[2])
             
             # Get listeners from the fourth cell
             try:
-                listeners = int(cells[3].text.strip())
+                listeners = int(_text(cells[3]))
             except (ValueError, IndexError):
                 listeners = 0
                 
             # Get status from the last cell
-            status = cells[-1].text.strip()
+            status = _text(cells[-1])
             
             # Create appropriate feed type based on whether this is a metro feed
             if metro_id is not None:
@@ -175,92 +345,126 @@ class FeedScraper:
             logger.error(f"Error parsing feed row: {e}")
             return None
     
-    def get_feeds_by_state(self, state: str) -> List[Feed]:
-        """Get all feeds for a state."""
-        state_id = self._get_state_id(state)
-        if not state_id:
-            logger.error(f"Could not find state ID for {state}")
-            return []
-            
-        url = f"https://www.broadcastify.com/listen/stid/{state_id}"
-        logger.debug(f"Fetching state page from {url}")
-        
-        soup = self._make_request(url)
-        if not soup:
-            return []
-            
-        # Use a set to deduplicate feeds by ID
-        feeds_by_id = {}
-        
+    def _parse_state_options(self, tree: html.HtmlElement) -> Tuple[List[int], List[int]]:
+        """Get the county and metro area IDs from a parsed state page."""
         # First get county IDs from the county select box
-        county_select = soup.find('select', {'name': 'ctid'})
-        if county_select:
-            for option in county_select.find_all('option'):
+        county_ids = []
+        county_select = _first(tree, _COUNTY_SELECT_XP)
+        if county_select is not None:
+            for option in county_select.iterfind('.//option'):
                 try:
                     # County options have format "ctid,ID"
-                    county_value = option['value']
+                    county_value = option.get('value', '')
                     if ',' in county_value:
                         _, county_id = county_value.split(',')
-                        county_id = int(county_id)
-                        county_name = option.text.strip()
-                        logger.debug(f"Processing county {county_name} (ID: {county_id})")
-                        county_feeds = self.get_feeds_by_county(county_id, state_id)
-                        for feed in county_feeds:
-                            feeds_by_id[feed.id] = feed
-                except (ValueError, KeyError) as e:
+                        county_ids.append(int(county_id))
+                        logger.debug(f"Found county {_text(option)} (ID: {county_id})")
+                except ValueError as e:
                     logger.error(f"Error processing county option: {e}")
                     continue
         else:
             logger.error("Could not find county select box")
             
         # Then get metro area IDs from the metro select box
-        metro_select = soup.find('select', {'name': 'mid', 'class': 'navBox'})
-        if metro_select:
-            for option in metro_select.find_all('option'):
+        metro_ids = []
+        metro_select = _first(tree, _METRO_SELECT_XP)
+        if metro_select is not None:
+            for option in metro_select.iterfind('.//option'):
                 try:
                     # Metro options have format "mid,ID"
-                    metro_value = option['value']
+                    metro_value = option.get('value', '')
                     if ',' in metro_value:
                         _, metro_id = metro_value.split(',')
-                        metro_id = int(metro_id)
-                        metro_name = option.text.strip()
-                        logger.debug(f"Processing metro area {metro_name} (ID: {metro_id})")
-                        metro_feeds = self.get_feeds_by_metro(metro_id)
-                        for feed in metro_feeds:
-                            # Only add metro feeds if they're not already in the list
-                            # or if the existing feed isn't a metro feed
-                            if feed.id not in feeds_by_id or not isinstance(feeds_by_id[feed.id], MetroFeed):
-                                feeds_by_id[feed.id] = feed
-                except (ValueError, KeyError) as e:
+                        metro_ids.append(int(metro_id))
+                        logger.debug(f"Found metro area {_text(option)} (ID: {metro_id})")
+                except ValueError as e:
                     logger.error(f"Error processing metro option: {e}")
                     continue
         else:
             logger.error("Could not find metro select box")
+        
+        return county_ids, metro_ids
+    
+    def get_feeds_by_state(self, state: str) -> List[Feed]:
+        """Get all feeds for a state."""
+        state_id = self._get_state_id(state)
+        if not state_id:
+            logger.error(f"Could not find state ID for {state}")
+            return []
+            
+        url = f"https://www.broadcastify.com/listen/stid/{state_id}"
+        logger.debug(f"Fetching state page from {url}")
+        
+        try:
+            content = self._get_page(url)
+        except Exception as e:
+            logger.error(f"Error fetching {url}: {e}")
+            return []
+        
+        # The state page is only needed for its two select boxes, so try
+        # pulling the option values out with a regex before parsing it
+        county_ids = _option_ids(_COUNTY_SELECT_RE, content)
+        metro_ids = _option_ids(_METRO_SELECT_RE, content)
+        if county_ids is None or metro_ids is None:
+            county_ids, metro_ids = self._parse_state_options(html.fromstring(content))
+        
+        # Select boxes can list an area more than once; fetch each page only once
+        county_ids = list(dict.fromkeys(county_ids))
+        metro_ids = list(dict.fromkeys(metro_ids))
+        
+        # Fetch every county and metro page concurrently
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            county_futures = [executor.submit(self._parse_county_page, county_id) for county_id in county_ids]
+            metro_futures = [executor.submit(self.get_feeds_by_metro, metro_id) for metro_id in metro_ids]
+            county_pages = [_result_or_default(future, ([], [])) for future in county_futures]
+            
+            # Coverage comes from the first county, in select order, that has a
+            # coverage form, as when counties were fetched one at a time
+            coverage_county = next((i for i, (_, urls) in enumerate(county_pages) if urls), None)
+            if coverage_county is not None and self._claim_coverage(state_id):
+                feeds, coverage_urls = county_pages[coverage_county]
+                logger.debug(f"Scraping coverage for state {state_id} from county {county_ids[coverage_county]}")
+                feeds.extend(self._get_coverage_feeds(coverage_urls))
+            
+            # Use a dict to deduplicate feeds by ID. Results are merged in
+            # page order so the outcome doesn't depend on completion order.
+            feeds_by_id = {}
+            for feeds, _ in county_pages:
+                for feed in feeds:
+                    feeds_by_id[feed.id] = feed
+            for future in metro_futures:
+                for feed in _result_or_empty(future):
+                    # Only add metro feeds if they're not already in the list
+                    # or if the existing feed isn't a metro feed
+                    existing = feeds_by_id.get(feed.id)
+                    if existing is None or type(existing) is not MetroFeed:
+                        feeds_by_id[feed.id] = feed
             
         return list(feeds_by_id.values())
-
+    
+    @_memoized
     def get_feeds_by_metro(self, metro_id: int) -> List[Feed]:
         """Get all feeds for a metro area."""
         url = f"https://www.broadcastify.com/listen/mid/{metro_id}"
         logger.debug(f"Fetching metro page from {url}")
         
-        soup = self._make_request(url)
-        if not soup:
+        tree = self._make_request(url)
+        if tree is None:
             return []
             
         feeds = []
         
         # Find all feed rows in the main table
-        feed_table = soup.find('table', {'class': 'btable'})
-        if not feed_table:
+        feed_table = _first(tree, _FEED_TABLE_XP)
+        if feed_table is None:
             logger.error(f"Could not find feed table on metro page {metro_id}")
             return []
             
-        rows = feed_table.find_all('tr')
-        logger.debug(f"Found {len(rows)} rows in feed table")
+        rows = feed_table.iterfind('.//tr')
         
         # Skip the first row (header)
-        for row in rows[1:]:
+        next(rows, None)
+        for row in rows:
             feed = self._parse_feed_row(row, metro_id=metro_id)
             if feed:
                 feeds.append(feed)
@@ -268,158 +472,187 @@ class FeedScraper:
         logger.debug(f"Found {len(feeds)} feeds in metro area {metro_id}")
         return feeds
     
-    def get_feeds_by_county(self, county_id: int, state_id: int) -> List[Feed]:
-        """Get feeds for a county."""
+    def _parse_county_page(self, county_id: int) -> Tuple[List[Feed], List[str]]:
+        """
+        Get a county's feeds and the URLs of the coverage pages its coverage form offers.
+        
+        The URL list is empty if the county page has no coverage form.
+        """
         url = f"https://www.broadcastify.com/listen/ctid/{county_id}"
         logger.debug(f"Fetching county page from {url}")
         
-        soup = self._make_request(url)
-        if not soup:
-            return []
+        tree = self._make_request(url)
+        if tree is None:
+            return [], []
             
         feeds = []
         
         # First get feeds from the main table
-        feed_table = soup.find('table', {'class': 'btable'})
-        if feed_table:
-            for row in feed_table.find_all('tr')[1:]:  # Skip header row
+        feed_table = _first(tree, _FEED_TABLE_XP)
+        if feed_table is not None:
+            rows = feed_table.iterfind('.//tr')
+            next(rows, None)  # Skip header row
+            for row in rows:
                 feed = self._parse_feed_row(row)
                 if feed:
                     feeds.append(feed)
-                    
-        # Check if this county has a coverage form and we haven't scraped this state yet
-        if state_id not in self._scraped_coverage_states:
-            logger.debug(f"Checking coverage for state {state_id}")
-            coverage_form = soup.find('form', {'action': '/calls/coverage/ctid/'})
-            if coverage_form:
-                logger.debug("Found coverage form")
-                service_select = coverage_form.find('select', {'name': 'tagId'})
-                if service_select:
-                    logger.debug("Found service select")
-                    # Get all service types available
-                    for option in service_select.find_all('option'):
-                        try:
-                            tag_id = int(option['value'])
-                            service_name = option.text.strip()
-                            logger.debug(f"Processing service: {service_name} (tagId={tag_id})")
-                            
-                            coverage_url = f"https://www.broadcastify.com/calls/coverage/ctid/?tagId={tag_id}&ctid={county_id}"
-                            logger.debug(f"Fetching coverage from: {coverage_url}")
-                            
-                            coverage_services = self.get_feeds_from_coverage(coverage_url)
-                            logger.debug(f"Found {len(coverage_services)} services from coverage")
-                            
-                            # Here you can process the coverage_services as needed
-                            # For now, let's convert them to Feed objects
-                            for service in coverage_services:
-                                for tg in service.talkgroups:
-                                    feed = Feed(
-                                        id=tg.id,
-                                        name=tg.display,
-                                        description=tg.description,
-                                        location=tg.system,
-                                        status=tg.last_seen,
-                                        listeners=0
-                                    )
-                                    feeds.append(feed)
-                                    
-                        except (ValueError, KeyError) as e:
-                            logger.error(f"Error processing service option: {e}")
-                            continue
-                            
-                    # Mark this state as scraped for coverage
-                    self._scraped_coverage_states.add(state_id)
-                    
+        
+        # Then the service types of the coverage form, if there is one
+        coverage_urls = []
+        service_select = _first(tree, _SERVICE_SELECT_XP)
+        if service_select is not None:
+            logger.debug("Found coverage service select")
+            for option in service_select.iterfind('.//option'):
+                try:
+                    tag_id = int(option.get('value', ''))
+                    service_name = _text(option)
+                    logger.debug(f"Processing service: {service_name} (tagId={tag_id})")
+                    coverage_urls.append(f"https://www.broadcastify.com/calls/coverage/ctid/?tagId={tag_id}&ctid={county_id}")
+                except ValueError as e:
+                    logger.error(f"Error processing service option: {e}")
+                    continue
+        
+        return feeds, coverage_urls
+    
+    def _claim_coverage(self, state_id: int) -> bool:
+        """Mark a state's coverage as scraped, returning False if it already was."""
+        with self._coverage_lock:
+            if state_id in self._scraped_coverage_states:
+                return False
+            self._scraped_coverage_states.add(state_id)
+            return True
+    
+    def _get_coverage_feeds(self, coverage_urls: List[str]) -> List[Feed]:
+        """Fetch a county's coverage pages concurrently and return their talkgroups as feeds."""
+        feeds = []
+        with ThreadPoolExecutor(max_workers=min(_COVERAGE_WORKERS, self.max_workers)) as executor:
+            for coverage_services in executor.map(self.get_feeds_from_coverage, coverage_urls):
+                logger.debug(f"Found {len(coverage_services)} services from coverage")
+                
+                # Here you can process the coverage_services as needed
+                # For now, let's convert them to Feed objects
+                for service in coverage_services:
+                    for tg in service.talkgroups:
+                        feed = Feed(
+                            id=tg.id,
+                            name=tg.display,
+                            description=tg.description,
+                            location=tg.system,
+                            status=tg.last_seen,
+                            listeners=0
+                        )
+                        feeds.append(feed)
         return feeds
     
+    @_memoized
+    def get_feeds_by_county(self, county_id: int, state_id: int) -> List[Feed]:
+        """
+        Get feeds for a county.
+        
+        If the county has a coverage form and the state's coverage hasn't
+        been scraped yet, the coverage feeds are included too.
+        """
+        feeds, coverage_urls = self._parse_county_page(county_id)
+        if coverage_urls and self._claim_coverage(state_id):
+            logger.debug(f"Scraping coverage for state {state_id} from county {county_id}")
+            feeds.extend(self._get_coverage_feeds(coverage_urls))
+        return feeds
+    
+    @_memoized
     def get_feeds_from_coverage(self, url: str) -> List[ServiceCoverage]:
         """Get feeds from a coverage page."""
         logger.debug(f"Fetching coverage page from {url}")
         
-        soup = self._make_request(url)
-        if not soup:
+        try:
+            content = self._get_page(url)
+        except Exception as e:
+            logger.error(f"Error fetching {url}: {e}")
             return []
             
         services = []
         
-        # Find all service cards
-        cards = soup.find_all('div', {'class': 'card-frame'})
-        for card in cards:
-            # Get service name from header
-            header = card.find('h6', {'class': 'card-header'})
-            if not header:
-                continue
-            service_name = header.text.strip()
-            
-            # Get tag ID from URL
-            tag_id_match = re.search(r'tagId=(\d+)', url)
-            if not tag_id_match:
-                continue
-            tag_id = int(tag_id_match.group(1))
-            
-            # Find talkgroup table
-            table = card.find('table', {'class': 'groupsTable'})
-            if not table:
-                continue
+        # Get tag ID from URL
+        tag_id_match = _TAG_ID_RE.search(url)
+        if not tag_id_match:
+            return services
+        tag_id = int(tag_id_match.group(1))
+        
+        # Handle service cards one at a time as they are parsed
+        try:
+            for card in _iter_coverage_cards(content):
+                # Get service name from header
+                header = _first(card, _CARD_HEADER_XP)
+                if header is None:
+                    continue
+                service_name = _text(header)
                 
-            talkgroups = []
-            
-            # Process each row
-            for row in table.find_all('tr')[1:]:  # Skip header row
-                try:
-                    cells = row.find_all('td')
-                    if len(cells) < 5:
-                        continue
+                # Find talkgroup table
+                table = _first(card, _GROUPS_TABLE_XP)
+                if table is None:
+                    continue
+                    
+                talkgroups = []
+                
+                # Process each row
+                rows = table.iterfind('.//tr')
+                next(rows, None)  # Skip header row
+                for row in rows:
+                    try:
+                        cells = _TD_XP(row)
+                        if len(cells) < 5:
+                            continue
+                            
+                        # Get talkgroup ID from first cell
+                        tg_link = cells[0].find('.//a')
+                        if tg_link is None:
+                            continue
+                        tg_value = tg_link.get('data-value', '')
+                        if not tg_value or '-' not in tg_value:
+                            continue
+                        system_id, tg_id = tg_value.split('-')
                         
-                    # Get talkgroup ID from first cell
-                    tg_link = cells[0].find('a')
-                    if not tg_link:
+                        talkgroups.append(TalkgroupCoverage(
+                            id=int(tg_id),
+                            system_id=int(system_id),
+                            display=_text(cells[1]),
+                            description=_text(cells[2]),
+                            system=_text(cells[3]),
+                            last_seen=_text(cells[4])
+                        ))
+                    except (ValueError, IndexError) as e:
+                        logger.error(f"Error parsing talkgroup row: {e}")
                         continue
-                    tg_value = tg_link.get('data-value', '')
-                    if not tg_value or '-' not in tg_value:
-                        continue
-                    system_id, tg_id = tg_value.split('-')
-                    
-                    talkgroups.append(TalkgroupCoverage(
-                        id=int(tg_id),
-                        system_id=int(system_id),
-                        display=cells[1].text.strip(),
-                        description=cells[2].text.strip(),
-                        system=cells[3].text.strip(),
-                        last_seen=cells[4].text.strip()
+                
+                if talkgroups:
+                    services.append(ServiceCoverage(
+                        tag_id=tag_id,
+                        name=service_name,
+                        talkgroups=talkgroups
                     ))
-                except (ValueError, IndexError) as e:
-                    logger.error(f"Error parsing talkgroup row: {e}")
-                    continue
-            
-            if talkgroups:
-                services.append(ServiceCoverage(
-                    tag_id=tag_id,
-                    name=service_name,
-                    talkgroups=talkgroups
-                ))
+        except etree.LxmlError as e:
+            logger.error(f"Error parsing coverage page {url}: {e}")
         
         return services
     
     def get_feed(self, feed_id: int) -> Optional[Feed]:
         """Get detailed information about a specific feed."""
         url = f"https://www.broadcastify.com/listen/feed/{feed_id}"
-        soup = self._make_request(url)
-        if not soup:
+        tree = self._make_request(url)
+        if tree is None:
             return None
             
         try:
             # Extract feed details from the page
-            title = soup.find('h1', {'class': 'btitle'})
-            description = soup.find('div', {'class': 'bdescription'})
-            status_div = soup.find('div', {'class': 'bstatus'})
+            title = _first(tree, _TITLE_XP)
+            description = _first(tree, _DESCRIPTION_XP)
+            status_div = _first(tree, _STATUS_XP)
             
             return Feed(
                 id=feed_id,
-                name=title.text.strip() if title else "Unknown",
-                description=description.text.strip() if description else "",
+                name=_text(title) if title is not None else "Unknown",
+                description=_text(description) if description is not None else "",
                 location="",  # Need to parse location from page
-                status=status_div.text.strip() if status_div else "Unknown"
+                status=_text(status_div) if status_div is not None else "Unknown"
             )
         except Exception as e:
             logger.error(f"Error parsing feed {feed_id}: {e}")
@@ -4,15 +4,19 @@ Scraper for radio system information.
 
 import logging
 import re
-from typing import Dict, List, Optional, Set
-import requests
-from bs4 import BeautifulSoup
+from typing import Dict, Iterator, List, Optional, Set
+from bs4 import BeautifulSoup, FeatureNotFound
+from lxml import etree
 
 from ..models import System, Talkgroup
-from ..utils.rate_limiter import RateLimiter
+from ..utils.rate_limiter import REQUEST_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
+_SYSTEM_TYPE_LABEL_RE = re.compile(r'System Type:')
+_SYSTEM_TYPE_RE = re.compile(r'System Type:\s*(\w+)')
+_ENCRYPTED_RE = re.compile(r'🔒|\[E\]')
+
 class SystemScraper:
     """
     Scraper for radio system information.
@@ -24,12 +28,10 @@ class SystemScraper:
     
     def __init__(self, client):
         self.client = client
-        self.rate_limiter = RateLimiter()
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "Mozilla/5.0",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8"
-        })
+        # Shared with the client's other scrapers
+        self.rate_limiter = client.rate_limiter
+        # Share the client's session so system pages reuse its open connections
+        self.session = client._session
         
         # Cache of system types
         self._system_types: Dict[int, str] = {}
@@ -38,41 +40,45 @@ class SystemScraper:
         """Make a rate-limited request and return parsed BeautifulSoup."""
         self.rate_limiter.wait("scrape")
         try:
-            response = self.session.get(url)
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
+            # Raw bytes let lxml pick up the encoding from the page itself
+            try:
+                return BeautifulSoup(response.content, 'lxml')
+            except FeatureNotFound:
+                return BeautifulSoup(response.content, 'html.parser')
         except Exception as e:
             logger.error(f"Error fetching {url}: {e}")
             return None
     
     def _parse_system_type(self, soup: BeautifulSoup) -> str:
         """Parse the system type from the page."""
-        type_div = soup.find('div', string=re.compile(r'System Type:'))
+        type_div = soup.find('div', string=_SYSTEM_TYPE_LABEL_RE)
         if type_div:
-            match = re.search(r'System Type:\s*(\w+)', type_div.text)
+            match = _SYSTEM_TYPE_RE.search(type_div.text)
             if match:
                 return match.group(1)
         return "Unknown"
     
-    def _parse_talkgroup_row(self, row, system_id: int) -> Optional[Talkgroup]:
+    def _parse_talkgroup_row(self, row: etree._Element, system_id: int) -> Optional[Talkgroup]:
         """Parse a table row into a Talkgroup object."""
         try:
-            cols = row.find_all('td')
+            cols = row.findall('td')
             if len(cols) < 3:
                 return None
                 
             # Extract talkgroup ID and details
-            tg_id = int(cols[0].text.strip())
-            alpha_tag = cols[1].text.strip()
-            description = cols[2].text.strip()
+            tg_id = int(''.join(cols[0].itertext()).strip())
+            alpha_tag = ''.join(cols[1].itertext()).strip()
+            description = ''.join(cols[2].itertext()).strip()
             
-            # Check for encryption indicator
-            encrypted = '🔒' in row.text or '[E]' in row.text
+            # Check for encryption indicator, stopping at the first string that has one
+            encrypted = any(_ENCRYPTED_RE.search(text) for text in row.itertext())
             
             return Talkgroup(
                 id=tg_id,
                 system_id=system_id,
-                name=alpha_tag,
+                alpha=alpha_tag,
                 description=description,
                 encrypted=encrypted
             )
@@ -119,7 +125,7 @@ class SystemScraper:
             logger.error(f"Error parsing system {system_id}: {e}")
             return None
     
-    def get_talkgroups(self, system_id: int) -> List[Talkgroup]:
+    def get_talkgroups(self, system_id: int) -> Optional[List[Talkgroup]]:
         """
         Get all talkgroups for a system.
         
@@ -127,21 +133,55 @@ class SystemScraper:
             system_id: System ID
             
         Returns:
-            List of Talkgroup objects
+            List of Talkgroup objects, or None if the page couldn't be
+            fetched or parsed in full
         """
-        url = f"https://www.broadcastify.com/calls/tg/{system_id}"
-        soup = self._make_request(url)
-        if not soup:
-            return []
+        try:
+            return list(self.iter_talkgroups(system_id))
+        except Exception:
+            # Already logged by iter_talkgroups; a partial list would look complete
+            return None
+    
+    def iter_talkgroups(self, system_id: int) -> Iterator[Talkgroup]:
+        """
+        Yield a system's talkgroups while its page is still downloading.
+        
+        Rows are parsed one at a time and dropped once yielded, so even
+        systems with thousands of talkgroups never sit in memory as a
+        whole page or tree.
+        
+        Args:
+            system_id: System ID
             
-        talkgroups = []
-        tg_table = soup.find('table', {'class': 'btable'})
-        if not tg_table:
-            return []
+        Yields:
+            Talkgroup objects
             
-        for row in tg_table.find_all('tr')[1:]:  # Skip header row
-            tg = self._parse_talkgroup_row(row, system_id)
-            if tg:
-                talkgroups.append(tg)
-        
-        return talkgroups
+        Raises:
+            Exception: If the page can't be fetched or parsed. Talkgroups
+                already yielded are then only part of the system's list.
+        """
+        url = f"https://www.broadcastify.com/calls/tg/{system_id}"
+        self.rate_limiter.wait("scrape")
+        try:
+            with self.session.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+                # Let urllib3 undo any gzip/brotli encoding as we read
+                response.raw.decode_content = True
+                
+                tg_table = None
+                for _, row in etree.iterparse(response.raw, events=('end',), tag='tr', html=True):
+                    table = next(row.iterancestors('table'), None)
+                    if table is not None and 'btable' in (table.get('class') or '').split():
+                        if tg_table is None:
+                            # Skip header row
+                            tg_table = table
+                        elif table is tg_table:
+                            tg = self._parse_talkgroup_row(row, system_id)
+                            if tg:
+                                yield tg
+                    row.clear()
+                    while row.getprevious() is not None:
+                        del row.getparent()[0]
+        except Exception as e:
+            logger.error(f"Error fetching {url}: {e}")
+            raise
@@ -3,7 +3,7 @@ Utility functions and classes for the Broadcastify API client.
 """
 
 from .cache import Cache
-from .rate_limiter import RateLimiter
+from .rate_limiter import REQUEST_TIMEOUT, RateLimiter, retrying_adapter
 from .time_utils import floor_dt, floor_dt_s
 
-__all__ = ["Cache", "RateLimiter", "floor_dt", "floor_dt_s"]
+__all__ = ["Cache", "RateLimiter", "REQUEST_TIMEOUT", "retrying_adapter", "floor_dt", "floor_dt_s"]
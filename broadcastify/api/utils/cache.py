@@ -4,12 +4,45 @@ Caching functionality to reduce load on Broadcastify servers.
 
 import os
 import pickle
-from datetime import datetime, timedelta
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
 from typing import Any, Dict, Optional
 
+import msgspec
+
+# Entries kept in memory in front of the database
+_MEMORY_ENTRIES = 4096
+
+# Blobs encoded with msgpack start with this marker; anything else is a pickle
+_MSGPACK_MARKER = b"M"
+_PLAIN_TYPES = (str, bytes, int, float, bool, type(None))
+
+def _is_plain(value: Any) -> bool:
+    """Whether msgpack can store a value and give back the same data."""
+    if isinstance(value, _PLAIN_TYPES):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(item) for item in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _is_plain(v) for k, v in value.items())
+    return False
+
+def _dumps(value: Any) -> bytes:
+    if _is_plain(value):
+        return _MSGPACK_MARKER + msgspec.msgpack.encode(value)
+    return pickle.dumps(value)
+
+def _loads(blob: bytes) -> Any:
+    if blob[:1] == _MSGPACK_MARKER:
+        return msgspec.msgpack.decode(blob[1:])
+    return pickle.loads(blob)
+
 class Cache:
     """
-    Simple file-based cache for API responses.
+    Simple SQLite-backed cache for API responses.
     
     This helps reduce load on the Broadcastify servers by caching responses
     locally. Different types of data have different expiration times.
@@ -22,14 +55,28 @@ class Cache:
             "talkgroup": timedelta(days=1),  # Talkgroup info might change daily
             "feed": timedelta(hours=1),      # Feed status changes frequently
             "call": timedelta(minutes=5),    # Call data very temporary
+            "page": timedelta(days=1),       # Raw pages, revalidated with the server once stale
+            "feed_system": timedelta(days=1), # System ID found in a feed's details (0 if none)
         }
         
         if not os.path.exists(cache_dir):
             os.makedirs(cache_dir)
-    
-    def _get_path(self, key: str, data_type: str) -> str:
-        """Get the full path for a cache file."""
-        return os.path.join(self.cache_dir, f"{data_type}_{key}.pickle")
+        
+        # Recently used entries as (timestamp, value), in least-recently-used order
+        self._memory: OrderedDict = OrderedDict()
+        
+        # One connection shared by all threads, serialized by the lock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, "cache.db"), check_same_thread=False)
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT, data_type TEXT, ts REAL, blob BLOB, "
+                "PRIMARY KEY (data_type, key))"
+            )
+            self._db.commit()
     
     def get(self, key: str, data_type: str = "default") -> Optional[Any]:
         """
@@ -42,23 +89,45 @@ class Cache:
         Returns:
             The cached value if it exists and hasn't expired, None otherwise.
         """
-        path = self._get_path(key, data_type)
-        if not os.path.exists(path):
-            return None
+        max_age = self.expiration.get(data_type, timedelta(hours=1)).total_seconds()
+        with self._lock:
+            hit = self._memory.get((data_type, key))
+            if hit is not None:
+                if time.time() - hit[0] <= max_age:
+                    self._memory.move_to_end((data_type, key))
+                    return hit[1]
+                del self._memory[(data_type, key)]
+            
+            row = self._db.execute(
+                "SELECT ts, blob FROM entries WHERE data_type = ? AND key = ?",
+                (data_type, key)
+            ).fetchone()
+            if row is None:
+                return None
             
-        try:
-            with open(path, 'rb') as f:
-                timestamp, data = pickle.load(f)
-                
             # Check if expired
-            age = datetime.now() - timestamp
-            if age > self.expiration.get(data_type, timedelta(hours=1)):
-                os.remove(path)
+            timestamp, blob = row
+            age = time.time() - timestamp
+            if age > max_age:
+                self._db.execute("DELETE FROM entries WHERE data_type = ? AND key = ?", (data_type, key))
+                self._db.commit()
                 return None
-                
-            return data
-        except (pickle.UnpicklingError, EOFError):
+        
+        try:
+            value = _loads(blob)
+        except (pickle.UnpicklingError, EOFError, msgspec.DecodeError):
             return None
+        
+        with self._lock:
+            self._remember((data_type, key), timestamp, value)
+        return value
+    
+    def _remember(self, memory_key: tuple, timestamp: float, value: Any) -> None:
+        """Keep an entry in memory, evicting the least recently used one when full."""
+        self._memory[memory_key] = (timestamp, value)
+        self._memory.move_to_end(memory_key)
+        if len(self._memory) > _MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
     
     def set(self, key: str, value: Any, data_type: str = "default") -> None:
         """
@@ -69,6 +138,17 @@ class Cache:
             value: Value to cache
             data_type: Type of data being cached
         """
-        path = self._get_path(key, data_type)
-        with open(path, 'wb') as f:
-            pickle.dump((datetime.now(), value), f)
+        blob = _dumps(value)
+        timestamp = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, data_type, ts, blob) VALUES (?, ?, ?, ?)",
+                (key, data_type, timestamp, blob)
+            )
+            self._db.commit()
+            self._remember((data_type, key), timestamp, value)
+    
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            self._db.close()
@@ -2,26 +2,92 @@
 Rate limiting functionality to avoid overloading the Broadcastify servers.
 """
 
+import math
+import threading
 import time
-from datetime import datetime, timedelta
-from typing import Dict, Optional
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout in seconds for requests to Broadcastify
+REQUEST_TIMEOUT = (5, 30)
+
+# Longest pause a response header can impose, in case of a bogus value
+_MAX_PAUSE = 300.0
+
+def _header_delay(value: Optional[str]) -> Optional[float]:
+    """
+    Seconds to wait according to a Retry-After or X-RateLimit-Reset value.
+    
+    Accepts a number of seconds, a unix timestamp or an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        delay = float(value)
+        if delay > 1e9:
+            # A unix timestamp rather than a number of seconds
+            delay -= time.time()
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(delay, 0.0), _MAX_PAUSE)
+
+def retrying_adapter(pool_maxsize: int = 10) -> HTTPAdapter:
+    """
+    Build an HTTP adapter that backs off when Broadcastify pushes back.
+    
+    Throttled (429) and unavailable (5xx) responses, connection errors and
+    timeouts are retried with exponential backoff, honouring any Retry-After
+    header the server sends. Other 4xx responses are returned straight away.
+    
+    Args:
+        pool_maxsize: Number of connections to keep open to the host.
+    """
+    return HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+    )
 
 class RateLimiter:
     """
     Rate limiter to prevent excessive requests to Broadcastify.
     
-    This implements a token bucket algorithm with different rate limits
-    for different types of requests.
+    Each type of request is spaced out by its own minimum interval, and all
+    requests together draw from a shared token bucket so mixing types can't
+    exceed the overall rate. Responses can pause every request through
+    update_from_headers, so one limiter should be shared by everything
+    talking to the same host.
     """
     
-    def __init__(self):
-        self.last_request: Dict[str, datetime] = {}
-        self.limits = {
-            "default": timedelta(seconds=1),  # 1 request per second
-            "live": timedelta(seconds=5),     # 1 request per 5 seconds for live calls
-            "archive": timedelta(seconds=2),   # 1 request per 2 seconds for archives
-            "scrape": timedelta(seconds=3),    # 1 request per 3 seconds for scraping
+    def __init__(self, global_rate: float = 1.0, global_capacity: float = 5.0):
+        # Guards the limiter's state; waiters reserve their slot under it, then sleep outside it
+        self._lock = threading.Lock()
+        # time.monotonic() of the last (or next reserved) request of each type
+        self.last_request: Dict[str, float] = {}
+        # Minimum seconds between requests of each type
+        self.limits: Dict[str, float] = {
+            "default": 1.0,  # 1 request per second
+            "live": 5.0,     # 1 request per 5 seconds for live calls
+            "archive": 2.0,  # 1 request per 2 seconds for archives
+            "scrape": 3.0,   # 1 request per 3 seconds for scraping
         }
+        # Shared bucket: refills at global_rate tokens per second, bursting up to global_capacity
+        self.global_rate = global_rate
+        self.global_capacity = global_capacity
+        self.global_tokens = global_capacity
+        self._refilled = time.monotonic()
+        # time.monotonic() before which no request may start, set from response headers
+        self._paused_until = 0.0
     
     def wait(self, request_type: str = "default") -> None:
         """
@@ -30,19 +96,79 @@ class RateLimiter:
         Args:
             request_type: Type of request being made. Controls which rate limit is used.
         """
-        if request_type in self.last_request:
-            elapsed = datetime.now() - self.last_request[request_type]
-            limit = self.limits.get(request_type, self.limits["default"])
-            if elapsed < limit:
-                time.sleep((limit - elapsed).total_seconds())
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            
+            # Start at whichever is later: this type's interval or a free token
+            deadline = self.last_request.get(request_type, -math.inf) + self.limits.get(request_type, self.limits["default"])
+            delay = max(
+                deadline - now,
+                (1.0 - self.global_tokens) / self.global_rate,
+                self._paused_until - now,
+                0.0
+            )
+            
+            # Reserve the slot now and sleep without the lock, so waiters of other
+            # types aren't held up. Tokens taken ahead of time go negative, which
+            # later waiters see as a longer wait for the next one.
+            self.global_tokens -= 1.0
+            self.last_request[request_type] = now + delay
         
-        self.last_request[request_type] = datetime.now()
+        if delay > 0:
+            time.sleep(delay)
+    
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Pause all requests if a response says the server wants us to back off.
+        
+        Honours Retry-After, and X-RateLimit-Reset once X-RateLimit-Remaining
+        reaches 0.
         
-    def __enter__(self, request_type: str = "default"):
-        """Enter context manager."""
-        self.wait(request_type)
+        Args:
+            headers: Response headers (case-insensitive, as on a requests.Response)
+        """
+        delay = _header_delay(headers.get("Retry-After"))
+        if delay is None and headers.get("X-RateLimit-Remaining") == "0":
+            delay = _header_delay(headers.get("X-RateLimit-Reset"))
+        if delay:
+            with self._lock:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+    
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last refill."""
+        self.global_tokens = min(self.global_capacity, self.global_tokens + (now - self._refilled) * self.global_rate)
+        self._refilled = now
+        
+    def __call__(self, request_type: str = "default") -> "_RateLimitedBlock":
+        """
+        Rate limit a block for a specific request type.
+        
+        Usage: ``with limiter("scrape"): ...``
+        """
+        return _RateLimitedBlock(self, request_type)
+    
+    def __enter__(self):
+        """Enter context manager, waiting on the default limit."""
+        self.wait()
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Exit context manager."""
         pass
+
+class _RateLimitedBlock:
+    """Context manager returned by RateLimiter.__call__."""
+    
+    __slots__ = ("limiter", "request_type")
+    
+    def __init__(self, limiter: RateLimiter, request_type: str):
+        self.limiter = limiter
+        self.request_type = request_type
+    
+    def __enter__(self) -> RateLimiter:
+        self.limiter.wait(self.request_type)
+        return self.limiter
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
@@ -1,71 +1,78 @@
 import datetime
+import logging
+import msgspec
 import requests
+import time
 
 from broadcastify.calls.Call import Call
 from broadcastify.calls.call_utils import generate_session_token
 
+logger = logging.getLogger(__name__)
+
 class LiveCalls:
-    def __init__(self, call_system, talkgroup, credential_key, **kwargs) -> None:
+    def __init__(self, call_system, talkgroup, credential_key, session: requests.Session = None, **kwargs) -> None:
         self.config = {
             "call_system": call_system,
             "talkgroup": talkgroup,
             "credential_key": credential_key,
             "session_token": generate_session_token(),
             "position": datetime.datetime.now().timestamp(),
+            "min_poll_interval": 0.5,
+            "max_poll_interval": 30,
             **kwargs
         }
+        self._session = session if session is not None else requests.Session()
+        # Sent with every request of this session
+        self._cookies = {
+            "bcfyuser1": credential_key
+        }
+        self._headers = {
+            "User-Agent": "Mozilla/5.0",
+            "Accept": "application/json, text/javascript, */*; q=0.01",
+            "Accept-Language": "en-US,en;q=0.5",
+            "X-Requested-With": "XMLHttpRequest",
+            "Origin": "https://www.broadcastify.com",
+            "Referer": f"https://www.broadcastify.com/calls/tg/{call_system}/{talkgroup}",
+        }
         self.calls = []
         self.hooks = {}
         self.session_initalized = False
+        # Polls in a row that returned no new calls
+        self._empty_streak = 0
     
     def on(self, event: str, callback) -> None:
-        if event not in self.hooks:
-            self.hooks[event] = []
-        self.hooks[event].extend(callback)
+        # Hooks are stored as tuples; registering is rare, dispatching happens on every poll
+        self.hooks[event] = self.hooks.get(event, ()) + (callback,)
 
     def _invoke(self, event: str, *args, **kwargs) -> None:
-        if event not in self.hooks:
-            return
-        for hook in self.hooks[event]:
+        for hook in self.hooks.get(event, ()):
             hook(*args, **kwargs)
 
-    def __make_livecall_request(self, payload) -> None:
-        cookies = {
-            "bcfyuser1": self.config["credential_key"]
-        }
-        headers = {
-            "User-Agent": "Mozilla/5.0",
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-            "Accept-Language": "en-US,en;q=0.5",
-            "X-Requested-With": "XMLHttpRequest",
-            "Origin": "https://www.broadcastify.com",
-            "Referer": f"https://www.broadcastify.com/calls/tg/{self.config['call_system']}/{self.config['talkgroup']}",
-        }
-        print(f"Making request with payload: {payload}")
-        print(f"Using credential key: {self.config['credential_key']}")
-        
-        # First, try to load the talkgroup page to get any necessary tokens
-        with requests.get(
+    def __load_talkgroup_page(self) -> None:
+        # Load the talkgroup page once to get any necessary tokens; the session keeps them for every poll
+        with self._session.get(
             f"https://www.broadcastify.com/calls/tg/{self.config['call_system']}/{self.config['talkgroup']}", 
-            cookies=cookies,
-            headers=headers
+            cookies=self._cookies,
+            headers=self._headers
         ) as response:
             if not response.ok:
-                print(f"Failed to load talkgroup page: {response.status_code}")
-                print(response.text)
+                logger.error("Failed to load talkgroup page: %s", response.status_code)
+                logger.debug("Talkgroup page content: %s", response.text)
+
+    def __make_livecall_request(self, payload) -> None:
+        logger.debug("Making request with payload: %s", payload)
         
-        # Now make the actual API request
-        with requests.post(
+        with self._session.post(
             f"https://www.broadcastify.com/calls/ajax/update", 
             data=payload, 
-            cookies=cookies,
-            headers=headers
+            cookies=self._cookies,
+            headers=self._headers
         ) as response:
             if not response.ok:
-                print(f"Response headers: {response.headers}")
-                print(f"Response content: {response.text}")
+                logger.debug("Response headers: %s", response.headers)
+                logger.debug("Response content: %s", response.text)
                 raise Exception(f"Failed to get live calls - server error {response.status_code}")
-            return response.json()
+            return msgspec.json.decode(response.content)
     
     def __invoke_poll(self, init=0) -> list[Call]:
         if not self.session_initalized and init == 0:
@@ -77,24 +84,44 @@ class LiveCalls:
             "lastUpdate": str(int(self.config["position"])),
             "mode": "gettalkgroups" if init == 1 else "getupdate"
         }
-        print(f"Polling with config: {self.config}")
+        logger.debug("Polling with config: %s", self.config)
         res = self.__make_livecall_request(payload)
-        print(f"Received response: {res}")
+        logger.debug("Received response: %s", res)
         if "calls" in res:
-            delta_calls = [Call(**call) for call in res["calls"]]
-            print(f"Extracted {len(delta_calls)} calls")
+            delta_calls = Call.from_api(res["calls"])
+            logger.debug("Extracted %d calls", len(delta_calls))
             self.calls.extend(delta_calls)
+            self._empty_streak = 0 if delta_calls else self._empty_streak + 1
             self._invoke("update", delta_calls)
             if delta_calls:
                 last_call = delta_calls[-1]
-                if hasattr(last_call, 'start_time'):
+                if last_call.start_time is not None:
                     self.config["position"] = last_call.start_time
+        else:
+            self._empty_streak += 1
         return self.calls
 
     def init_session(self) -> list[Call]:
+        self.__load_talkgroup_page()
         calls = self.__invoke_poll(init=1)
         self.session_initalized = True
         return calls
 
     def poll(self) -> list[Call]:
-        return self.__invoke_poll()
\ No newline at end of file
+        return self.__invoke_poll()
+
+    def next_poll_delay(self) -> float:
+        # Back off exponentially while polls come back empty, and repoll quickly once calls arrive
+        delay = self.config["min_poll_interval"] * 2 ** min(self._empty_streak, 16)
+        return min(self.config["max_poll_interval"], delay)
+
+    def run(self):
+        # Poll forever, yielding each batch of new calls as it arrives
+        if not self.session_initalized:
+            self.init_session()
+        while True:
+            time.sleep(self.next_poll_delay())
+            seen = len(self.calls)
+            self.poll()
+            if len(self.calls) > seen:
+                yield self.calls[seen:]
\ No newline at end of file
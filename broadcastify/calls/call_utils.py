@@ -1,9 +1,21 @@
+import msgspec
 import requests
-import random
+import os
 
 from broadcastify.calls.Call import Call
 
-def get_archived_calls(call_system: int, talkgroup: int, time_block: int, credential_key: str) -> tuple[list[Call], int, int]:
+class _ArchiveResponse(msgspec.Struct):
+    calls: list[Call]
+    start: int
+    end: int
+
+# Decodes the response straight into Call structs, skipping the intermediate dicts
+_archive_decoder = msgspec.json.Decoder(_ArchiveResponse, strict=False)
+
+# (connect, read) timeout in seconds, the same as broadcastify.api's REQUEST_TIMEOUT
+REQUEST_TIMEOUT = (5, 30)
+
+def get_archived_calls(call_system: int, talkgroup: int, time_block: int, credential_key: str, session: requests.Session = None) -> tuple[list[Call], int, int]:
     # https://www.broadcastify.com/calls/apis/archivecall.php
     url = "https://www.broadcastify.com/calls/apis/archivecall.php"
     payload = {
@@ -13,16 +25,20 @@ def get_archived_calls(call_system: int, talkgroup: int, time_block: int, creden
     cookies = {
         "bcfyuser1": credential_key
     }
-    with requests.get(url, params=payload, cookies=cookies) as response:
+    # Reuse the caller's session (and its open connections) when one is given
+    http = session if session is not None else requests
+    with http.get(url, params=payload, cookies=cookies, timeout=REQUEST_TIMEOUT) as response:
         if not response.ok:
             raise Exception(f"Failed to get archived calls - server error {response.status_code}")
-        res_decoded = response.json()
-        if "calls" not in res_decoded:
-            raise Exception("Failed to get archived calls - calls key not found in response")
-        
-        start_time, end_time = res_decoded["start"], res_decoded["end"]
+        try:
+            res_decoded = _archive_decoder.decode(response.content)
+        except msgspec.DecodeError as e:
+            # Covers bodies that aren't JSON (e.g. an HTML error page) as well as unexpected JSON
+            raise Exception(f"Failed to get archived calls - unexpected response ({e})")
 
-        return [Call(**call) for call in res_decoded["calls"]], start_time, end_time
+        return res_decoded.calls, res_decoded.start, res_decoded.end
 
 def generate_session_token():
-    return f"{random.randint(0,0xFFFFFFFF):08x}-{''.join(hex(random.randint(0,15) & 0x3 | 0x8)[2:] for _ in range(4))}"
\ No newline at end of file
+    # 8 hex digits, then 4 digits from 8-b like the site's own tokens
+    token = os.urandom(8)
+    return f"{token[:4].hex()}-{''.join('89ab'[b & 0x3] for b in token[4:])}"
\ No newline at end of file
@@ -4,5 +4,7 @@ def floor_dt(dt: int, delta: timedelta) -> datetime:
     dt = datetime.fromtimestamp(dt)
     return dt - (dt - datetime.min) % delta
 
-def floor_dt_s(dt: int, delta: timedelta) -> int:
-    return floor_dt(dt, delta).timestamp()
+def floor_dt_s(dt: int, step: int) -> int:
+    # Floors on the unix timestamp directly; step is in seconds
+    dt = int(dt)
+    return dt - dt % step
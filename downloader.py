@@ -1,18 +1,47 @@
 import broadcastify
 import datetime
+import functools
 import requests
 import inquirer
-import whisper
 import tqdm
+import shutil
 import os
 
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
 from pprint import pprint
-from broadcastify.utility import floor_dt
+from requests.adapters import HTTPAdapter
 
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+# Calls downloaded at once
+DOWNLOAD_WORKERS = 16
+
+# Calls transcribed together in one batch
+TRANSCRIBE_BATCH = 8
+
+# The 48 half-hour blocks of a day, as "HH:MM --> HH:MM"
+_TIME_BLOCKS = tuple(
+    f"{mins // 60:02}:{mins % 60:02} --> {(mins + 29) // 60:02}:{(mins + 29) % 60:02}"
+    for mins in range(0, 24 * 60, 30)
+)
+
+@functools.lru_cache(maxsize=4096)
 def format_unix_timestamp(unix_timestamp: int) -> str:
     return datetime.datetime.fromtimestamp(unix_timestamp).strftime("%Y-%m-%d %H:%M:%S")
 
-def download_file(url, directory=".", chunk_size=8192):
+def make_download_session(credential_key: str = None) -> requests.Session:
+    # One session for every download so connections to the CDN are reused
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=DOWNLOAD_WORKERS, pool_maxsize=2 * DOWNLOAD_WORKERS))
+    if credential_key:
+        session.cookies.set("bcfyuser1", credential_key)
+    return session
+
+def download_file(url, directory=".", session: requests.Session = None, chunk_size=65536):
     # Construct local path
     local_filename = url.split('/')[-1]
     local_path = os.path.join(directory, local_filename)
@@ -21,13 +50,49 @@ def download_file(url, directory=".", chunk_size=8192):
     os.makedirs(directory, exist_ok=True)
 
     # Download file
-    with requests.get(url, stream=True) as r:
+    with (session or requests).get(url, stream=True) as r:
         r.raise_for_status()
-        with open(local_path, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=chunk_size):
-                f.write(chunk)
+        # Copy straight from the socket into the file, undoing any transfer encoding
+        r.raw.decode_content = True
+        with open(local_path, 'wb', buffering=chunk_size) as f:
+            shutil.copyfileobj(r.raw, f, chunk_size)
     return local_path
 
+def start_downloads(executor: ThreadPoolExecutor, session: requests.Session, calls: list[broadcastify.calls.Call], calls_dir: str) -> dict[str, Future]:
+    # Submit every call that isn't on disk yet; returns the download futures by call filename
+    # One directory listing instead of a stat per call
+    existing = {entry.name for entry in os.scandir(calls_dir) if entry.name.endswith(".mp3")} if os.path.isdir(calls_dir) else set()
+    downloads = {}
+    for call in calls:
+        if f"{call.filename}.mp3" in existing:
+            print(f"Call {call.filename} already downloaded, skipping...")
+            continue
+        downloads[call.filename] = executor.submit(download_file, call.get_media_url(), calls_dir, session)
+    print(f"Downloading {len(downloads)} calls...")
+    return downloads
+
+def wait_for_downloads(downloads: dict[str, Future]):
+    filenames = {future: filename for filename, future in downloads.items()}
+    with tqdm.tqdm(total=len(filenames), ncols=80) as pbar:
+        for future in as_completed(filenames):
+            pbar.update(1)
+            try:
+                future.result()
+            except requests.exceptions.RequestException as e:
+                print(f"Failed to download call {filenames[future]}: {e}")
+
+def download_succeeded(downloads: dict[str, Future], call: broadcastify.calls.Call) -> bool:
+    # Wait for a call's download, if it had one; calls already on disk count as downloaded
+    future = downloads.get(call.filename)
+    if future is None:
+        return True
+    try:
+        future.result()
+        return True
+    except requests.exceptions.RequestException as e:
+        print(f"Failed to download call {call.filename}: {e}")
+        return False
+
 def prompt_default(prompt, default_val):
     val = input(f"{prompt} [{default_val}]: ")
     if not val:
@@ -39,16 +104,10 @@ def iq_day_query() -> inquirer.Text:
     return inquirer.Text("day", message="Enter day in YYYY-MM-DD format", default=today)
 
 def iq_time_block_query() -> inquirer.List:
-    options = []
-    for i in range(0, 48):
-        mins = i * 30
-        options.append(f"{mins // 60:02}:{mins % 60:02} --> {(mins + 29) // 60:02}:{(mins + 29) % 60:02}")
     now = datetime.datetime.now()
-    closest_time_block = floor_dt(now.timestamp(), datetime.timedelta(minutes=30))
-    closest_time_block_offset = (closest_time_block + datetime.timedelta(minutes=29))
-    default_time_block = closest_time_block.strftime("%H:%M") + " --> " + closest_time_block_offset.strftime("%H:%M")
+    default_time_block = _TIME_BLOCKS[(now.hour * 60 + now.minute) // 30]
 
-    return inquirer.List("time_block", message="Select time block", choices=options, default=default_time_block)
+    return inquirer.List("time_block", message="Select time block", choices=_TIME_BLOCKS, default=default_time_block)
 
 def time_block_and_day_to_seconds(day: str, time_block: str) -> int:
     day_formatted = datetime.datetime.strptime(day, "%Y-%m-%d")
@@ -101,15 +160,72 @@ def average_logprob(transcription: dict) -> float:
         return
     return sum([x["avg_logprob"] for x in transcription['segments']]) / len(transcription['segments'])
 
+def load_transcription_model():
+    # Prefer faster-whisper's int8 CTranslate2 backend when it is installed
+    if WhisperModel is None:
+        # Otherwise transcription needs the "transcription" extra, imported only once chosen
+        import whisper
+        return whisper.load_model("medium.en")
+    
+    import ctranslate2
+    if ctranslate2.get_cuda_device_count() > 0:
+        return WhisperModel("medium.en", device="cuda", compute_type="int8_float16")
+    return WhisperModel("medium.en", device="cpu", compute_type="int8", cpu_threads=os.cpu_count())
+
+def transcribe_calls(model, calls: list[broadcastify.calls.Call], call_paths: list[str]) -> list[dict]:
+    if WhisperModel is not None and isinstance(model, WhisperModel):
+        transcriptions = []
+        for call_path in call_paths:
+            segments, _ = model.transcribe(call_path, language="en", beam_size=5, vad_filter=True)
+            segments = list(segments)
+            transcriptions.append({
+                "text": "".join(segment.text for segment in segments),
+                "segments": [{"avg_logprob": segment.avg_logprob} for segment in segments]
+            })
+        return transcriptions
+
+    import torch
+    import whisper
+
+    # Whisper decodes 30 second windows, so calls that fit in one are padded and decoded
+    # together as a single batch; longer calls go through model.transcribe on their own
+    fp16 = model.device.type == "cuda"
+    transcriptions = [None] * len(calls)
+    batched = [i for i, call in enumerate(calls) if call.duration is not None and call.duration <= whisper.audio.CHUNK_LENGTH]
+    if batched:
+        mels = [
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(whisper.load_audio(call_paths[i])), model.dims.n_mels)
+            for i in batched
+        ]
+        options = whisper.DecodingOptions(language="en", fp16=fp16)
+        results = model.decode(torch.stack(mels).to(model.device), options)
+        for i, result in zip(batched, results):
+            # Shaped like model.transcribe's output, with the window as the only segment
+            transcriptions[i] = {"text": result.text, "segments": [{"avg_logprob": result.avg_logprob}]}
+    for i, call_path in enumerate(call_paths):
+        if transcriptions[i] is None:
+            transcriptions[i] = model.transcribe(call_path, fp16=fp16, language="en")
+    return transcriptions
+
+def apply_manual_transcriptions(path: str, replacements: dict[str, str]):
+    # Rewrite the file once, swapping whole lines for their manual transcription
+    with open(path, "r") as src, open(path + ".tmp", "w") as dst:
+        for line in src:
+            identifier = line.rstrip("\n")
+            if identifier in replacements:
+                line = replacements[identifier] + "\n"
+            dst.write(line)
+    os.replace(path + ".tmp", path)
+
 def clamp(val, min_val, max_val):
     return max(min(val, max_val), min_val)
 
 def main():
     cred_key = None
     if os.path.exists("broadcastify_creds.txt"):
-        cred_key = open("broadcastify_creds.txt", "r").read()
+        cred_key = Path("broadcastify_creds.txt").read_text()
 
-    username, password = open("login.txt", "r").read().rstrip().split(":")
+    username, password = Path("login.txt").read_text().rstrip().split(":")
 
     client = broadcastify.Client(
         username=username,
@@ -130,79 +246,80 @@ def main():
         start_time = calls[0].start_time
         end_time = calls[-1].start_time
 
+    # Downloads run in the background so transcription can start on the first calls
+    # while later ones are still arriving
     calls_dir = "calls"
-    for call in calls:
-        if os.path.exists(os.path.join(calls_dir, f"{call.filename}.mp3")):
-            print(f"Call {call.filename} already downloaded, skipping...")
-            continue
-        print(f"Downloading call: {call}...")
-        try:
-            download_file(call.get_media_url(), calls_dir)
-        except requests.exceptions.HTTPError as e:
-            print(f"Failed to download call {call.filename}: {e}")
-            continue
+    executor = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS)
+    downloads = start_downloads(executor, make_download_session(client.config["credential_key"]), calls, calls_dir)
     
     if not do_transcribe:
+        wait_for_downloads(downloads)
+        executor.shutdown()
         return
 
     print("Transcribing calls...")
-    model = whisper.load_model("medium.en")
+    model = load_transcription_model()
     
     if not os.path.exists("transcriptions.txt"):
         with open("transcriptions.txt", "w") as f:
             f.write(f"Transcriptions for calls from {format_unix_timestamp(start_time)} to {format_unix_timestamp(end_time)} - Talkgroup {calls[0].tg_name}\n")
 
-    with open("transcriptions.txt", "a+") as f:
-        last_call_id: int
+    with open("transcriptions.txt", "a+", buffering=65536) as f:
         skip = 0
         manual_transcriptions = []
         try:
             # Skip to last call ID if it exists
             if os.path.exists("last_call_id.txt"):
-                skip = int(open("last_call_id.txt", "r").read())
-
-            # Transcribe calls
-            with tqdm.tqdm(total=len(calls), ncols=80) as pbar:
-                for last_call_id, call in enumerate(calls):
-                    pbar.update(1)
-                    if last_call_id <= skip:
-                        continue
-
-                    call_path = os.path.join(calls_dir, f"{call.filename}.mp3")
-                    transcripton = model.transcribe(call_path, fp16=False, language="en")
-                    f.write(f"{format_unix_timestamp(call.start_time)} (RadioID {call.unit_radioid}): {transcripton['text']}\n")
+                skip = int(Path("last_call_id.txt").read_text())
+            last_call_id = skip
+
+            # Transcribe calls in batches, writing them out in call order
+            pending = [(call_id, call) for call_id, call in enumerate(calls) if call_id > skip]
+            with tqdm.tqdm(total=len(calls), initial=len(calls) - len(pending), ncols=80) as pbar:
+                for start in range(0, len(pending), TRANSCRIBE_BATCH):
+                    window = pending[start:start + TRANSCRIBE_BATCH]
+                    batch = [(call_id, call) for call_id, call in window if download_succeeded(downloads, call)]
+                    pbar.update(len(window) - len(batch))
+                    batch_calls = [call for _, call in batch]
+                    call_paths = [os.path.join(calls_dir, f"{call.filename}.mp3") for call in batch_calls]
+                    transcriptions = transcribe_calls(model, batch_calls, call_paths)
+                    for (call_id, call), call_path, transcripton in zip(batch, call_paths, transcriptions):
+                        f.write(f"{format_unix_timestamp(call.start_time)} (RadioID {call.unit_radioid}): {transcripton['text']}\n")
+                        try:
+                            alp = average_logprob(transcripton)
+                            if alp and alp < -0.85:
+                                manual_transcriptions.append((call_path, transcripton["text"], format_unix_timestamp(call.start_time), call.unit_radioid), )
+                        except KeyError:
+                            print(transcripton)
+                        last_call_id = call_id
+                        pbar.update(1)
+                    # Flush once per batch; anything still buffered is written when the file closes
                     f.flush()
-                    try:
-                        alp = average_logprob(transcripton)
-                        if alp and alp < -0.85:
-                            manual_transcriptions.append((call_path, transcripton["text"], format_unix_timestamp(call.start_time), call.unit_radioid), )
-                    except KeyError:
-                        print(transcripton)
 
         except KeyboardInterrupt:
             print("Transcription interrupted")
+            f.flush()
             with open("last_call_id.txt", "w") as f2:
                 f2.write(str(last_call_id))
+        finally:
+            executor.shutdown(cancel_futures=True)
     
     if manual_transcriptions:
-        with open("transcriptions.txt", "r") as f:
-            contents = f.read()
-
         a = inquirer.prompt([inquirer.Confirm("manual_transcribe", message="Would you like to manually transcribe these calls?", default=False)])
 
         print("Manual transcriptions reccomended:")        
+        replacements = {}
         try:
             for call_path, transcription, start_time, unit_radioid in manual_transcriptions:
                 identifier = f"{start_time} (RadioID {unit_radioid}): {transcription}"
                 print(f"Call {call_path} - {identifier}")
                 if a["manual_transcribe"]:
                     input_transcription = input("Enter transcription: ")
-                    new_identifier = f"{start_time} (RadioID {unit_radioid}): {input_transcription}"
-                    contents = contents.replace(identifier, new_identifier)
+                    replacements[identifier] = f"{start_time} (RadioID {unit_radioid}): {input_transcription}"
         except KeyboardInterrupt:
             print("Manual transcription interrupted")
-        with open("transcriptions.txt", "w") as f:
-            f.write(contents)
+        if replacements:
+            apply_manual_transcriptions("transcriptions.txt", replacements)
 
 
 if __name__ == "__main__":
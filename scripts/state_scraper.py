@@ -9,13 +9,16 @@ This script scrapes all Broadcastify endpoints for a given state, including:
 - Recent calls for active talkgroups
 """
 
-import os
+import re
 import sys
-import json
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Set, Optional
+from pathlib import Path
+from typing import Dict, List, Set, Optional, Tuple, Union
 import click
+import msgspec
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
@@ -23,42 +26,98 @@ from rich.table import Table
 from broadcastify.api.client import BroadcastifyClient
 from broadcastify.api.models import Feed, System, Talkgroup, Call
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# Handlers are only set up by main(), so importing this module doesn't configure logging
 logger = logging.getLogger(__name__)
 
 # Set up rich console
 console = Console()
 
+# Ways feeds mention their system ID, earlier ones preferred:
+# - "System ID: 1234"
+# - "SystemID=1234"
+# - "SID: 1234"
+# - links to /trs/1234 or /sid/1234
+# Each format has its own group, so group number is preference.
+_SYSTEM_ID_RE = re.compile(r'System ID:?\s*(\d+)|SystemID=(\d+)|SID:?\s*(\d+)|/trs/(\d+)|/sid/(\d+)')
+
+def _find_system_id(text: str) -> Optional[int]:
+    """Find the system ID in text in a single scan, preferring the earlier formats."""
+    best = None
+    for match in _SYSTEM_ID_RE.finditer(text):
+        if match.lastindex == 1:
+            return int(match.group(1))
+        if best is None or match.lastindex < best.lastindex:
+            best = match
+    return int(best.group(best.lastindex)) if best else None
+
+def _write_json(path: Path, obj) -> None:
+    """
+    Write obj to path as JSON indented like json.dump(..., indent=2), encoded by msgspec.
+    
+    The whole file is serialized first and written in one call.
+    
+    The api models are slotted dataclasses, which msgspec encodes directly
+    with the same fields as their to_dict().
+    """
+    path.write_bytes(msgspec.json.format(msgspec.json.encode(obj), indent=2))
+
+def _load_credentials(username: Optional[str], password: Optional[str]) -> Tuple[str, str]:
+    """
+    Return the given credentials, or read them from login.txt ("username:password").
+    
+    Raises:
+        ValueError: If no credentials were given and login.txt can't be used
+    """
+    if username and password:
+        return username, password
+    try:
+        username, password = Path('login.txt').read_text().strip().split(':')
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Could not read login.txt: {e}") from e
+    return username, password
+
 class StateScraper:
     """Scrapes all Broadcastify data for a state."""
     
-    def __init__(self, username: str, password: str, output_dir: str = "output"):
+    def __init__(self, username: str, password: str, output_dir: Union[str, Path] = "output",
+                 max_workers: int = 8, refresh: bool = False):
         self.client = BroadcastifyClient(username, password)
-        self.output_dir = output_dir
+        self.output_dir = str(output_dir)
+        self.output_path = Path(output_dir)
+        # Ignore feed -> system IDs cached by earlier runs
+        self.refresh = refresh
+        # Feeds and systems scraped at once; the client's rate limiters still pace the requests
+        self.max_workers = max_workers
         
         # Create output directory
-        os.makedirs(output_dir, exist_ok=True)
+        self.output_path.mkdir(parents=True, exist_ok=True)
         
         # Track what we've seen
         self.seen_systems: Set[int] = set()
-        self.seen_talkgroups: Set[tuple] = set()  # (system_id, tg_id)
         
         # Store results
         self.feeds: List[Feed] = []
         self.systems: Dict[int, System] = {}
         self.talkgroups: Dict[int, List[Talkgroup]] = {}
         self.recent_calls: Dict[tuple, List[Call]] = {}
+        
+        # Running totals for the summary
+        self._n_talkgroups = 0
+        self._n_calls = 0
     
     def scrape_state(self, state: str):
         """Scrape everything for a state."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Output files are written on their own thread, overlapping with the rest of the scrape
+        writer = ThreadPoolExecutor(max_workers=1)
+        
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
-            console=console
+            console=console,
+            # Tasks advance far more often than this; redrawing less keeps slow terminals out of the way
+            refresh_per_second=4,
+            transient=True
         ) as progress:
             # Login
             task = progress.add_task("[cyan]Logging in...", total=None)
@@ -71,56 +130,101 @@ class StateScraper:
             task = progress.add_task("[cyan]Getting feeds...", total=None)
             self.feeds = self.client.feed_scraper.get_feeds_by_state(state)
             progress.remove_task(task)
+            feeds_saved = writer.submit(self._save_feeds, timestamp)
             
-            # Get systems and talkgroups
-            task = progress.add_task(
-                f"[cyan]Processing {len(self.feeds)} feeds...",
-                total=len(self.feeds)
-            )
-            
-            for feed in self.feeds:
-                # Extract system ID from feed details
-                system_id = self._extract_system_id(feed)
-                if not system_id or system_id in self.seen_systems:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Find the system behind each feed, fetching feed details concurrently
+                task = progress.add_task(
+                    f"[cyan]Processing {len(self.feeds)} feeds...",
+                    total=len(self.feeds)
+                )
+                
+                system_ids = []
+                for system_id in executor.map(self._extract_system_id, self.feeds):
+                    if system_id and system_id not in self.seen_systems:
+                        self.seen_systems.add(system_id)
+                        system_ids.append(system_id)
                     progress.advance(task)
-                    continue
-                    
-                self.seen_systems.add(system_id)
                 
-                # Get system info
-                system = self.client.system_scraper.get_system(system_id)
-                if system:
-                    self.systems[system_id] = system
-                    
-                    # Get talkgroups
-                    talkgroups = self.client.system_scraper.get_talkgroups(system_id)
-                    self.talkgroups[system_id] = talkgroups
-                    
-                    # Get recent calls for each talkgroup
-                    for tg in talkgroups:
-                        key = (system_id, tg.id)
-                        if key in self.seen_talkgroups:
-                            continue
-                        self.seen_talkgroups.add(key)
-                        
-                        calls = self.client.call_scraper.get_live_calls(
-                            system_id, tg.id
-                        )
-                        if calls:
-                            self.recent_calls[key] = calls
+                progress.remove_task(task)
                 
-                progress.advance(task)
-            
-            progress.remove_task(task)
+                # Get systems, talkgroups and recent calls, several systems at a time
+                task = progress.add_task(
+                    f"[cyan]Scraping {len(system_ids)} systems...",
+                    total=len(system_ids)
+                )
+                
+                for system_id, system, talkgroups, recent_calls in executor.map(self._scrape_system, system_ids):
+                    if system:
+                        self.systems[system_id] = system
+                    if system and talkgroups is not None:
+                        self.talkgroups[system_id] = talkgroups
+                        self.recent_calls.update(recent_calls)
+                        self._n_talkgroups += len(talkgroups)
+                        self._n_calls += sum(len(calls) for calls in recent_calls.values())
+                    progress.advance(task)
+                
+                progress.remove_task(task)
         
         # Save results
-        self._save_results()
+        self._save_results(timestamp)
+        feeds_saved.result()
+        writer.shutdown()
         
         # Display summary
         self._display_summary()
     
+    def _scrape_system(self, system_id: int) -> Tuple[int, Optional[System], Optional[List[Talkgroup]], Dict[tuple, List[Call]]]:
+        """Get a system, its talkgroups and their recent calls. Runs in a worker thread."""
+        system = self.client.system_scraper.get_system(system_id)
+        if not system:
+            return system_id, None, [], {}
+        
+        # Get talkgroups; None means the page failed partway, so there's no list to save
+        talkgroups = self.client.system_scraper.get_talkgroups(system_id)
+        if talkgroups is None:
+            return system_id, system, None, {}
+        
+        # Get recent calls for the whole system at once, bucketed by talkgroup
+        tg_ids = list(dict.fromkeys(tg.id for tg in talkgroups))
+        recent_calls = {}
+        system_calls = self.client.call_scraper.get_live_calls_for_system(system_id)
+        if system_calls is not None:
+            by_tg = defaultdict(list)
+            for call in system_calls:
+                by_tg[call.talkgroup_id].append(call)
+            for tg_id in tg_ids:
+                if tg_id in by_tg:
+                    recent_calls[(system_id, tg_id)] = by_tg[tg_id]
+        else:
+            # Fall back to one request per talkgroup
+            for tg_id in tg_ids:
+                calls = self.client.call_scraper.get_live_calls(system_id, tg_id)
+                if calls:
+                    recent_calls[(system_id, tg_id)] = calls
+        
+        return system_id, system, talkgroups, recent_calls
+    
     def _extract_system_id(self, feed: Feed) -> Optional[int]:
-        """Extract system ID from feed details."""
+        """
+        Extract system ID from feed details.
+        
+        The feed's own name and description from the state listing are
+        checked first, so feed details are only fetched when they don't
+        mention a system. Results are kept in the client's cache for a day,
+        so re-runs skip the feed details request. Feeds without a system ID
+        are cached as 0.
+        """
+        system_id = _find_system_id(f"{feed.description} {feed.name}")
+        if system_id:
+            return system_id
+        
+        key = str(feed.id)
+        if not self.refresh:
+            cached = self.client.cache.get(key, "feed_system")
+            if cached is not None:
+                return cached or None
+        
         try:
             # Get detailed feed info
             feed_details = self.client.get_feed(feed.id)
@@ -128,59 +232,32 @@ class StateScraper:
                 return None
                 
             # Look for system ID in description or other fields
-            # Common formats:
-            # - "System ID: 1234"
-            # - "SystemID=1234"
-            # - "SID: 1234"
-            import re
-            patterns = [
-                r'System ID:?\s*(\d+)',
-                r'SystemID=(\d+)',
-                r'SID:?\s*(\d+)',
-                r'/trs/(\d+)',
-                r'/sid/(\d+)'
-            ]
-            
             text = f"{feed_details.description} {feed_details.name}"
-            for pattern in patterns:
-                match = re.search(pattern, text)
-                if match:
-                    return int(match.group(1))
-            
-            return None
+            system_id = _find_system_id(text)
+            self.client.cache.set(key, system_id or 0, "feed_system")
+            return system_id
         except Exception as e:
-            logger.error(f"Error extracting system ID: {e}")
+            logger.error("Error extracting system ID: %s", e)
             return None
     
-    def _save_results(self):
-        """Save results to JSON files."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Save feeds
-        with open(f"{self.output_dir}/feeds_{timestamp}.json", 'w') as f:
-            feed_dicts = [feed.to_dict() for feed in self.feeds]
-            json.dump(feed_dicts, f, indent=2)
-        
-        # Save systems
-        with open(f"{self.output_dir}/systems_{timestamp}.json", 'w') as f:
-            json.dump({
-                str(sid): system.to_dict()
-                for sid, system in self.systems.items()
-            }, f, indent=2)
+    def _save_feeds(self, timestamp: str):
+        """Save feeds to a JSON file. Runs on the writer thread."""
+        _write_json(self.output_path / f"feeds_{timestamp}.json", self.feeds)
+    
+    def _save_results(self, timestamp: str):
+        """Save systems, talkgroups and recent calls to JSON files."""
+        base = self.output_path
+        # Save systems (msgspec writes the int keys as strings)
+        _write_json(base / f"systems_{timestamp}.json", self.systems)
         
         # Save talkgroups
-        with open(f"{self.output_dir}/talkgroups_{timestamp}.json", 'w') as f:
-            json.dump({
-                str(sid): [tg.to_dict() for tg in tgs]
-                for sid, tgs in self.talkgroups.items()
-            }, f, indent=2)
+        _write_json(base / f"talkgroups_{timestamp}.json", self.talkgroups)
         
         # Save recent calls
-        with open(f"{self.output_dir}/recent_calls_{timestamp}.json", 'w') as f:
-            json.dump({
-                f"{sid}_{tgid}": [call.to_dict() for call in calls]
-                for (sid, tgid), calls in self.recent_calls.items()
-            }, f, indent=2)
+        _write_json(base / f"recent_calls_{timestamp}.json", {
+            "%d_%d" % key: calls
+            for key, calls in self.recent_calls.items()
+        })
     
     def _display_summary(self):
         """Display a colorful summary of what was found."""
@@ -193,14 +270,8 @@ class StateScraper:
         
         table.add_row("Feeds", str(len(self.feeds)))
         table.add_row("Systems", str(len(self.systems)))
-        table.add_row(
-            "Talkgroups",
-            str(sum(len(tgs) for tgs in self.talkgroups.values()))
-        )
-        table.add_row(
-            "Recent Calls",
-            str(sum(len(calls) for calls in self.recent_calls.values()))
-        )
+        table.add_row("Talkgroups", str(self._n_talkgroups))
+        table.add_row("Recent Calls", str(self._n_calls))
         
         console.print(table)
         
@@ -226,26 +297,36 @@ class StateScraper:
     default='output',
     help='Output directory'
 )
+@click.option(
+    '--workers', '-w',
+    default=8,
+    show_default=True,
+    help='Feeds and systems to scrape at once'
+)
+@click.option(
+    '--refresh',
+    is_flag=True,
+    default=False,
+    help='Re-fetch feed details instead of using cached system IDs'
+)
 @click.option('--debug/--no-debug', default=False, help='Enable debug logging')
-def main(state: str, username: str, password: str, output: str, debug: bool):
+def main(state: str, username: str, password: str, output: str, workers: int, refresh: bool, debug: bool):
     """Scrape all Broadcastify data for a STATE."""
-    if debug:
-        logging.getLogger().setLevel(logging.DEBUG)
-        logging.getLogger('broadcastify').setLevel(logging.DEBUG)
+    logging.basicConfig(
+        level=logging.DEBUG if debug else logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     
-    if not username or not password:
-        # Try to load from login.txt
-        try:
-            with open('login.txt') as f:
-                username, password = f.read().strip().split(':')
-        except Exception:
-            console.print(
-                "[red]Error: Please provide credentials via options "
-                "or in login.txt[/red]"
-            )
-            sys.exit(1)
+    try:
+        username, password = _load_credentials(username, password)
+    except ValueError:
+        console.print(
+            "[red]Error: Please provide credentials via options "
+            "or in login.txt[/red]"
+        )
+        sys.exit(1)
     
-    scraper = StateScraper(username, password, output)
+    scraper = StateScraper(username, password, output, max_workers=workers, refresh=refresh)
     try:
         scraper.scrape_state(state)
     except KeyboardInterrupt:
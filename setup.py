@@ -4,15 +4,24 @@ setup(
     name="broadcastify",
     version="0.1.0",
     packages=find_packages(),
+    python_requires=">=3.10",
     install_requires=[
         "requests>=2.25.1",
+        "brotli",
+        "msgspec>=0.18",
         "beautifulsoup4>=4.9.3",
+        "lxml",
         "click>=8.0.0",
         "rich>=10.0.0",
-        "numpy<2",
-        "torch",
-        "openai-whisper==20231117",
     ],
+    extras_require={
+        # Only downloader.py's transcription needs these
+        "transcription": [
+            "numpy<2",
+            "torch",
+            "openai-whisper==20231117",
+        ],
+    },
     entry_points={
         'console_scripts': [
             'state-scraper=scripts.state_scraper:main',